@@ -0,0 +1,135 @@
+import os, sys, json, time, argparse, tempfile, platform, warnings
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+import ga_core
+
+# Benchmarks for the GA hot paths: fitness evaluation, operators, baselines and output writing.
+#   python bench_ga.py --datasets bundled synthetic:10000x200 --pop-sizes 30 200 --n-jobs 1 4 --out bench.json
+#   python bench_ga.py --baseline bench.json        # fails (exit 1) when a case got slower than the tolerance
+# Synthetic datasets are "synthetic:ROWSxCOLS", e.g. synthetic:1000000x30 or synthetic:2000x50000.
+
+STAGES = ("fitness", "operators", "baselines", "outputs")
+
+def load_bench_dataset(spec: str, seed: int = 0):
+    if spec == "bundled":
+        X, y, _ = ga_core.load_data(ga_core.CONFIG["DATA_PATH"])
+        return X, y
+    if spec.startswith("synthetic:"):
+        from sklearn.datasets import make_classification
+        rows, cols = (int(v) for v in spec.split(":", 1)[1].lower().split("x"))
+        X, y = make_classification(n_samples=rows, n_features=cols, n_informative=min(10, cols),
+                                   n_redundant=min(10, max(0, cols - 10)), random_state=seed)
+        return pd.DataFrame(X, columns=[f"f{i}" for i in range(cols)]), pd.Series(y)
+    raise ValueError("Unknown dataset: "+spec)
+
+def best_time(fn, repeat: int):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+def bench_fitness(X, y, cfg, repeat):
+    X_arr, y_arr = ga_core.as_float_array(X), np.asarray(y).astype(int)
+    pop = np.random.default_rng(cfg.random_state).random((cfg.pop_size, X_arr.shape[1])) < 0.5
+    with ga_core.evaluation_pool(X_arr, y_arr, cfg) as executor:
+        # a fresh evaluator per repeat so the fitness cache never hides the model fits
+        return best_time(lambda: ga_core.PopulationEvaluator(X_arr, y_arr, cfg, executor)(pop), repeat)
+
+def bench_operators(n_features, cfg, repeat):
+    rng = np.random.default_rng(cfg.random_state)
+    pop = rng.random((cfg.pop_size, n_features)) < 0.5
+    fit = rng.random(cfg.pop_size)
+    packed = ga_core.PackedPopulation.from_bool(pop)
+    return {"bool": best_time(lambda: ga_core.next_generation(pop, fit, rng, cfg), repeat),
+            "packed": best_time(lambda: ga_core.next_generation_packed(packed, fit, rng, cfg), repeat)}
+
+def bench_baselines(X, y, cfg, repeat):
+    selected = list(X.columns[: max(1, X.shape[1] // 2)])
+    return best_time(lambda: ga_core.evaluate_baselines(X, y, selected, cfg, "accuracy"), repeat)
+
+def bench_outputs(X, y, cfg, repeat):
+    selected = list(X.columns[: max(1, X.shape[1] // 2)])
+    hist = pd.DataFrame({"gen": range(cfg.generations), "best": np.linspace(0.9, 1, cfg.generations),
+                         "mean": np.linspace(0.8, 0.9, cfg.generations)})
+    comparison = pd.DataFrame({"Method": ["Full", "GA"], "CV_Score": [0.9, 0.95],
+                               "Metric": ["accuracy"] * 2, "NumFeatures": [X.shape[1], len(selected)]})
+    mask_df = pd.DataFrame({"feature": X.columns, "selected": X.columns.isin(selected)})
+
+    pop = np.random.default_rng(cfg.random_state).random((cfg.pop_size, X.shape[1])) < 0.5
+    fit = np.linspace(0.8, 0.9, cfg.pop_size)
+
+    def write():
+        # the run artifact run_pipeline writes; CSV/PNG exports are opt-in now
+        with tempfile.TemporaryDirectory() as out_dir:
+            path = ga_core.save_run_artifact(out_dir, ga_core.CONFIG, X.columns, mask_df["selected"], 0.95, hist,
+                                             pop, fit, {"before_after": comparison, "comparison": comparison})
+            ga_core.RunArtifact(path).close()
+    return best_time(write, repeat)
+
+def run_benchmarks(args):
+    base = ga_core.config_from_dict(ga_core.CONFIG)
+    results = {}
+    for spec in args.datasets:
+        X, y = load_bench_dataset(spec)
+        print(f"[{spec}] X={X.shape}")
+        for pop_size in args.pop_sizes:
+            cfg = replace(base, pop_size=pop_size, engine=args.engine)
+            if "operators" in args.stages:
+                for rep, t in bench_operators(X.shape[1], cfg, args.repeat).items():
+                    results[f"{spec}/operators/{rep}/pop={pop_size}"] = t
+            if "fitness" in args.stages:
+                for n_jobs in args.n_jobs:
+                    jcfg = replace(cfg, n_jobs=n_jobs, evaluator=args.evaluator if n_jobs > 1 else "serial")
+                    results[f"{spec}/fitness/{args.engine}/pop={pop_size}/jobs={n_jobs}"] = \
+                        bench_fitness(X, y, jcfg, args.repeat)
+        if "baselines" in args.stages:
+            results[f"{spec}/baselines"] = bench_baselines(X, y, base, args.repeat)
+        if "outputs" in args.stages:
+            results[f"{spec}/outputs"] = bench_outputs(X, y, base, args.repeat)
+    for key, t in results.items():
+        print(f"{key:60s} {t:9.4f}s")
+    return results
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    regressions = []
+    for key, t in results.items():
+        ref = baseline.get(key)
+        if ref is not None and t > ref * (1 + tolerance):
+            regressions.append((key, ref, t))
+            print(f"REGRESSION {key}: {ref:.4f}s -> {t:.4f}s ({t / ref - 1:+.0%})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the GA hot paths")
+    parser.add_argument("--datasets", nargs="+", default=["bundled", "synthetic:5000x30"])
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=STAGES)
+    parser.add_argument("--pop-sizes", nargs="+", type=int, default=[30, 200])
+    parser.add_argument("--n-jobs", nargs="+", type=int, default=[1])
+    parser.add_argument("--evaluator", default="process", choices=["thread", "process"])
+    parser.add_argument("--engine", default="sklearn", choices=["sklearn", "batched"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs. baseline")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    results = run_benchmarks(args)
+    if args.out:
+        meta = {"python": platform.python_version(), "numpy": np.__version__, "cpus": os.cpu_count(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
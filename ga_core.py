@@ -1,24 +1,26 @@
-import os, warnings, json, time
+import os, sys, warnings, json, time, shutil, tempfile, argparse, hashlib, sqlite3, queue
+import multiprocessing as mp
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace
 from typing import Literal
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
-from sklearn.model_selection import StratifiedKFold, cross_val_score
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LogisticRegression
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.feature_selection import RFE, SelectKBest, f_classif
-from sklearn.metrics import make_scorer, f1_score
-
-warnings.filterwarnings("ignore")
-print("Libraries loaded successfully ✅")
+# sklearn, scipy and matplotlib are imported inside the functions that use them, so that
+# `import ga_core` stays cheap for workers and embedding applications.
 
 CONFIG = {
     "DATA_PATH": "breast_cancer_wisconsin.csv",
+    "DATA_CACHE": None,
+    "DATA_DTYPE": "float64",
     "MODEL_NAME": "logreg",
     "METRIC": "accuracy",
     "CV_SPLITS": 5,
@@ -31,37 +33,69 @@ CONFIG = {
     "LAMBDA": 0.005,
     "MIN_FEATURES": 1,
     "EARLY_STOP": True,
-    "PATIENCE": 8
+    "PATIENCE": 8,
+    "CACHE_SIZE": 4096,
+    "EVALUATOR": "serial",
+    "N_JOBS": 1,
+    "CROSSOVER": "one_point",
+    "TOURNAMENT_K": 3,
+    "REPRESENTATION": "bool",
+    "ENGINE": "sklearn",
+    "RACING": False,
+    "SURROGATE": False,
+    "SURROGATE_BUDGET": 0.5,
+    "CHECKPOINT_PATH": None,
+    "CHECKPOINT_EVERY": 0,
+    "RESUME_FROM": None,
+    "ISLANDS": 1,
+    "MIGRATE_EVERY": 5,
+    "N_MIGRANTS": 2,
+    "TOPOLOGY": "ring",
+    "STORE_PATH": None,
+    "TRACE_PATH": None,
+    "SELECTION": "tournament",
+    "DT_BINS": 0,
+    "RIDGE_ALPHA": 1.0,
+    "RFE_STEP": 1,
+    "PRESCREEN": False,
+    "PRESCREEN_KEEP": 0.5,
+    "PRESCREEN_REDUNDANCY": 0.95,
+    "ADAPTIVE": False,
+    "DIVERSITY_TARGET": 0.05,
+    "FITNESS_STD_TARGET": 0.001,
+    "PM_MAX": 0.2,
+    "PC_MIN": 0.5,
+    "RESTART_DIVERSITY": 0.03,
+    "RESTART_FRAC": 0.5
 }
 
 def get_scorer(metric: str):
+    from sklearn.metrics import make_scorer, f1_score
     m = metric.lower()
     if m in ("f1","f1_macro"):
         return make_scorer(f1_score, average="macro")
     return "accuracy"
 
-SCORER = get_scorer(CONFIG["METRIC"])
-
-def prepare_X_y(df: pd.DataFrame):
+def find_target(columns):
     # اكتشاف العمود الهدف تلقائياً
-    target_col = None
-    for c in df.columns:
+    for c in columns:
         if c.lower() in ["diagnosis","target","label","class"]:
-            target_col = c
-            break
-    if target_col is None:
-        target_col = df.columns[-1]
+            return c
+    return columns[-1]
 
-    y_raw = df[target_col]
-    if y_raw.dtype == object:
+def encode_labels(y_raw: pd.Series) -> pd.Series:
+    if not pd.api.types.is_numeric_dtype(y_raw):
         mapping = {"malignant":1, "benign":0, "m":1, "b":0, "yes":1, "no":0}
         y = y_raw.astype(str).str.strip().str.lower().map(lambda v: mapping.get(v, v))
         try:
-            y = y.astype(int)
+            return y.astype(int)
         except Exception:
-            y = (y_raw.astype('category').cat.codes).astype(int)
-    else:
-        y = y_raw.astype(int)
+            return (y_raw.astype('category').cat.codes).astype(int)
+    return y_raw.astype(int)
+
+def prepare_X_y(df: pd.DataFrame):
+    target_col = find_target(list(df.columns))
+    y = encode_labels(df[target_col])
 
     X = df.drop(columns=[target_col]).copy()
     drop_cols = []
@@ -76,12 +110,88 @@ def prepare_X_y(df: pd.DataFrame):
     X = X.fillna(X.median(numeric_only=True))
     return X, y, target_col
 
-if not os.path.exists(CONFIG["DATA_PATH"]):
-    raise FileNotFoundError(f"❌ ملف البيانات غير موجود: {CONFIG['DATA_PATH']}")
+def load_data(path: str, cache_dir: str = None, dtype: str = "float64"):
+    # with cache_dir the CSV is converted once to .npy files and memory-mapped (see convert_csv)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"❌ ملف البيانات غير موجود: {path}")
+    if cache_dir:
+        return load_cached(convert_csv(path, cache_dir, dtype))
+    return prepare_X_y(pd.read_csv(path))
 
-df = pd.read_csv(CONFIG["DATA_PATH"])
-X, y, target_col = prepare_X_y(df)
-print(f"✅ Data loaded: X={X.shape}, y={y.shape}, target='{target_col}'")
+# OUT-OF-CORE DATA
+# A converted dataset is a directory with X.npy (column-major features, so a block of columns is one
+# contiguous read), y.npy (encoded labels) and meta.json. Its name hashes the CSV's path, size and mtime, so an edited CSV is converted again.
+_MAPPED = {}  # X.npy path -> memmap handed out by load_cached
+
+def _cache_name(path: str, dtype: str):
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{np.dtype(dtype).name}"
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}-{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"
+
+def convert_csv(path: str, cache_dir: str, dtype: str = "float64", chunksize: int = 100_000):
+    # Same cleaning as prepare_X_y, streamed: the first pass reads only the target column (row count
+    # and labels), the second writes feature chunks into a preallocated .npy; NaNs get column medians.
+    out = os.path.join(cache_dir, _cache_name(path, dtype))
+    if os.path.exists(os.path.join(out, "meta.json")):
+        return out
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    target_col = find_target(columns)
+    features = [c for c in columns if c != target_col]
+    y = encode_labels(pd.concat(pd.read_csv(path, usecols=[target_col], chunksize=chunksize),
+                                ignore_index=True)[target_col])
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir)
+    try:
+        X = np.lib.format.open_memmap(os.path.join(tmp, "X.npy"), mode="w+", dtype=dtype,
+                                      shape=(len(y), len(features)), fortran_order=True)
+        has_nan, start = False, 0
+        for chunk in pd.read_csv(path, usecols=features, chunksize=chunksize):
+            block = chunk[features].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=dtype)
+            has_nan |= bool(np.isnan(block).any())
+            X[start:start + len(block)] = block
+            start += len(block)
+        if has_nan:
+            step = max(1, (64 << 20) // max(1, 8 * len(y)))
+            med = np.concatenate([np.nanmedian(X[:, a:a + step], axis=0)
+                                  for a in range(0, len(features), step)]).astype(dtype)
+            for a in range(0, len(y), chunksize):
+                block = X[a:a + chunksize]
+                X[a:a + chunksize] = np.where(np.isnan(block), med, block)
+        X.flush()
+        del X
+        np.save(os.path.join(tmp, "y.npy"), y.to_numpy())
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"source": os.path.abspath(path), "target": target_col, "columns": features,
+                       "dtype": np.dtype(dtype).name}, f, ensure_ascii=False)
+        try:
+            os.replace(tmp, out)
+        except OSError:  # another process finished the same conversion first
+            pass
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return out
+
+def load_cached(out: str):
+    # X comes back as a DataFrame over a read-only memmap (no copy); as_float_array recovers the mapping
+    with open(os.path.join(out, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    x_path = os.path.join(out, "X.npy")
+    X = _MAPPED.get(x_path)
+    if X is None:
+        X = _MAPPED[x_path] = np.load(x_path, mmap_mode="r")
+    X_df = pd.DataFrame(X, columns=meta["columns"], copy=False)
+    return X_df, pd.Series(np.load(os.path.join(out, "y.npy")), name=meta["target"]), meta["target"]
+
+def as_float_array(X):
+    # the memmap behind a load_cached frame (so process workers map the same file), else a float copy
+    values = np.asarray(X)
+    for mm in _MAPPED.values():
+        if (values.shape == mm.shape and values.strides == mm.strides
+                and values.__array_interface__["data"][0] == mm.__array_interface__["data"][0]):
+            return mm
+    return np.asarray(values, dtype=float)
 
 # GA CLASSES & FUNCTIONS
 @dataclass
@@ -92,181 +202,1997 @@ class GAConfig:
     pm: float
     elitism: int
     penalty_lambda: float
-    model_name: Literal["logreg","dt"]
+    model_name: Literal["logreg","dt","ridge"]
     scorer: object
     cv_splits: int
     random_state: int
     min_features: int
     early_stop: bool = True
     patience: int = 10
+    cache_size: int = 4096
+    evaluator: Literal["serial","thread","process"] = "serial"
+    n_jobs: int = 1
+    crossover: Literal["one_point","two_point","uniform"] = "one_point"
+    tournament_k: int = 3
+    representation: Literal["bool","packed"] = "bool"
+    engine: Literal["sklearn","batched"] = "sklearn"
+    racing: bool = False
+    surrogate: bool = False
+    surrogate_budget: float = 0.5
+    surrogate_min_samples: int = 50
+    surrogate_archive: int = 5000
+    surrogate_alpha: float = 1.0
+    checkpoint_path: str = None
+    checkpoint_every: int = 0
+    checkpoint_seconds: float = 0.0
+    islands: int = 1
+    migrate_every: int = 5
+    n_migrants: int = 2
+    topology: Literal["ring","full"] = "ring"
+    store_path: str = None
+    store_max_rows: int = 1_000_000
+    trace_path: str = None
+    selection: Literal["tournament","nsga2"] = "tournament"
+    dt_bins: int = 0
+    ridge_alpha: float = 1.0
+    prescreen: bool = False
+    prescreen_keep: float = 0.5
+    prescreen_redundancy: float = 0.95
+    prescreen_bins: int = 16
+    penalty_n: int = 0  # size-penalty denominator; 0 = the columns the GA sees (set to the full width after pre-screening)
+    adaptive: bool = False
+    diversity_target: float = 0.05
+    fitness_std_target: float = 0.001
+    pm_max: float = 0.2
+    pc_min: float = 0.5
+    restart_diversity: float = 0.03
+    restart_frac: float = 0.5
 
-def make_model(name: str, seed: int = 42):
+def make_model(name: str, seed: int = 42, alpha: float = 1.0):
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.tree import DecisionTreeClassifier
     if name == "logreg":
         return Pipeline([("scaler", StandardScaler()),
                          ("clf", LogisticRegression(max_iter=500, solver="liblinear", random_state=seed))])
     elif name == "dt":
         return DecisionTreeClassifier(random_state=seed)
+    elif name == "ridge":
+        from sklearn.linear_model import RidgeClassifier
+        return Pipeline([("scaler", StandardScaler()), ("clf", RidgeClassifier(alpha=alpha))])
     else:
         raise ValueError("Unknown model: "+name)
 
-def fitness(mask: np.ndarray, X: np.ndarray, y: np.ndarray, cfg: GAConfig):
-    if mask.sum() < cfg.min_features: return -np.inf
-    cols = np.where(mask)[0]
-    model = make_model(cfg.model_name, cfg.random_state)
+def fold_splits(y: np.ndarray, cfg: GAConfig):
+    # the StratifiedKFold (train, test) index pairs shared by the GA and the baseline comparison
+    from sklearn.model_selection import StratifiedKFold
     cv = StratifiedKFold(n_splits=cfg.cv_splits, shuffle=True, random_state=cfg.random_state)
-    acc = cross_val_score(model, X[:, cols], y, cv=cv, scoring=cfg.scorer).mean()
-    penalty = cfg.penalty_lambda * (len(cols)/X.shape[1])
+    return [(tr, te) for tr, te in cv.split(np.zeros((len(y), 1)), y)]
+
+class FoldPlan:
+    # CV folds and per-fold scaler statistics, fixed by cfg.random_state and shared by every fitness call
+    def __init__(self, X: np.ndarray, y: np.ndarray, cfg: GAConfig):
+        from sklearn.metrics import get_scorer as sk_get_scorer
+        self.folds = fold_splits(y, cfg)
+        self.y_train = [y[tr] for tr, _ in self.folds]
+        self.y_test = [y[te] for _, te in self.folds]
+        self.scorer = sk_get_scorer(cfg.scorer) if isinstance(cfg.scorer, str) else cfg.scorer
+        self.mean, self.scale = [], []
+        self.codes, self.metric, self.dt_bins = {}, None, cfg.dt_bins
+        if cfg.model_name == "dt":
+            if cfg.dt_bins > 256:
+                raise ValueError("dt_bins must be at most 256 (bin codes are stored as uint8)")
+            try:
+                self.metric = _prediction_metric(self.scorer)
+            except ValueError:
+                pass
+        if cfg.model_name in ("logreg", "ridge"):
+            # one pass over ~64MB row chunks (a memory-mapped X is read once, never copied whole); each
+            # chunk's training rows are merged into the fold's running count/mean/M2 (Chan et al.)
+            k, d = len(self.folds), X.shape[1]
+            in_train = np.zeros((k, len(y)), dtype=bool)
+            for j, (tr, _) in enumerate(self.folds):
+                in_train[j, tr] = True
+            count, mean, m2 = np.zeros(k), np.zeros((k, d)), np.zeros((k, d))
+            step = max(1, (64 << 20) // max(1, X.itemsize * d))
+            for a in range(0, len(y), step):
+                blk = np.asarray(X[a:a + step], dtype=float)
+                for j in range(k):
+                    rows = blk[in_train[j, a:a + step]]
+                    if not len(rows):
+                        continue
+                    mb = rows.mean(axis=0)
+                    delta, tot = mb - mean[j], count[j] + len(rows)
+                    mean[j] += delta * (len(rows) / tot)
+                    m2[j] += ((rows - mb) ** 2).sum(axis=0) + delta ** 2 * (count[j] * len(rows) / tot)
+                    count[j] = tot
+            std = np.sqrt(m2 / count[:, None])
+            std[std < 10 * np.finfo(X.dtype).eps] = 1.0
+            self.mean = list(mean.astype(X.dtype, copy=False))
+            self.scale = list(std.astype(X.dtype, copy=False))
+
+    def __len__(self):
+        return len(self.folds)
+
+    def fold_data(self, X: np.ndarray, cols: np.ndarray, j: int):
+        tr, te = self.folds[j]
+        Xtr, Xte = X[np.ix_(tr, cols)], X[np.ix_(te, cols)]
+        if self.mean:
+            mu, sd = self.mean[j][cols], self.scale[j][cols]
+            Xtr = (Xtr - mu) / sd
+            Xte = (Xte - mu) / sd
+        return Xtr, Xte
+
+    def tree_data(self, X: np.ndarray, cols: np.ndarray, j: int):
+        # dt folds as float32 Fortran arrays, the dtype/layout the tree builder works in. Exact trees gather
+        # straight from X: this is the same conversion sklearn would do, it only keeps a memmap from being
+        # copied whole (sklearn no longer presorts, so there is nothing to reuse across fits). With
+        # dt_bins > 0 the fit gathers the fold's cached bin codes instead (approximate splits)
+        if self.dt_bins:
+            ctr, cte = self.bin_codes(X, j)
+            return (np.asfortranarray(ctr[:, cols], dtype=np.float32),
+                    np.asfortranarray(cte[:, cols], dtype=np.float32))
+        tr, te = self.folds[j]
+        return (np.asfortranarray(X[np.ix_(tr, cols)], dtype=np.float32),
+                np.asfortranarray(X[np.ix_(te, cols)], dtype=np.float32))
+
+    def bin_codes(self, X: np.ndarray, j: int):
+        # fold j's uint8 quantile-bin index of every column for its (train, test) rows, binned on the
+        # training rows' float32 quantiles; built once in ~64MB column blocks, then kept (folds x n x d bytes)
+        if j not in self.codes:
+            tr, te = self.folds[j]
+            q = np.linspace(0, 1, self.dt_bins + 1)[1:-1]
+            ctr = np.empty((len(tr), X.shape[1]), dtype=np.uint8, order="F")
+            cte = np.empty((len(te), X.shape[1]), dtype=np.uint8, order="F")
+            step = max(1, (64 << 20) // (4 * len(X)))
+            for a in range(0, X.shape[1], step):
+                Xtr = X[tr, a:a + step].astype(np.float32)
+                Xte = X[te, a:a + step].astype(np.float32)
+                edges = np.quantile(Xtr, q, axis=0).astype(np.float32)
+                for i in range(Xtr.shape[1]):
+                    e = np.unique(edges[:, i])
+                    ctr[:, a + i] = np.searchsorted(e, Xtr[:, i], side="right")
+                    cte[:, a + i] = np.searchsorted(e, Xte[:, i], side="right")
+            self.codes[j] = ctr, cte
+        return self.codes[j]
+
+def make_estimator(name: str, seed: int = 42, alpha: float = 1.0):
+    # the bare classifier from make_model; scaling is done from the FoldPlan statistics
+    if name == "logreg":
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(max_iter=500, solver="liblinear", random_state=seed)
+    if name == "ridge":
+        from sklearn.linear_model import RidgeClassifier
+        return RidgeClassifier(alpha=alpha)
+    return make_model(name, seed)
+
+def fold_scores(mask: np.ndarray, X: np.ndarray, y: np.ndarray, cfg: GAConfig, plan: FoldPlan, folds=None,
+                timings: list = None):
+    # timings, if given, receives the wall time of each fold's fit+score
+    cols = np.where(mask)[0]
+    scores = []
+    for j in (range(len(plan)) if folds is None else folds):
+        t0 = time.perf_counter()
+        if cfg.model_name == "dt":
+            Xtr, Xte = plan.tree_data(X, cols, j)
+            model = make_estimator(cfg.model_name, cfg.random_state).fit(Xtr, plan.y_train[j], check_input=False)
+            if plan.metric is not None:
+                metric, kwargs, sign = plan.metric
+                pred = model.predict(Xte, check_input=False)
+                scores.append(sign * _batch_metric(metric, kwargs, plan.y_test[j], pred[:, None])[0])
+            else:
+                scores.append(plan.scorer(model, Xte, plan.y_test[j]))
+        else:
+            Xtr, Xte = plan.fold_data(X, cols, j)
+            model = make_estimator(cfg.model_name, cfg.random_state, cfg.ridge_alpha).fit(Xtr, plan.y_train[j])
+            scores.append(plan.scorer(model, Xte, plan.y_test[j]))
+        if timings is not None:
+            timings.append(time.perf_counter() - t0)
+    return np.array(scores)
+
+def timed_fold_scores(mask, X, y, cfg: GAConfig, plan: FoldPlan, folds):
+    timings = []
+    return fold_scores(mask, X, y, cfg, plan, folds, timings), timings
+
+def fitness(mask: np.ndarray, X: np.ndarray, y: np.ndarray, cfg: GAConfig, plan: FoldPlan = None):
+    if mask.sum() < cfg.min_features: return -np.inf
+    if plan is None:
+        plan = FoldPlan(X, y, cfg)
+    acc = fold_scores(mask, X, y, cfg, plan).mean()
+    penalty = cfg.penalty_lambda * (mask.sum()/(cfg.penalty_n or X.shape[1]))
     return float(acc - penalty)
 
-def tournament(pop, fit, rng, k=3):
-    idxs = rng.choice(len(pop), size=k, replace=False)
-    return pop[idxs[np.argmax(fit[idxs])]].copy()
-
-def crossover(p1, p2, rng, pc):
-    if rng.rand() < pc:
-        point = rng.randint(1, len(p1))
-        return np.r_[p1[:point], p2[point:]], np.r_[p2[:point], p1[point:]]
-    return p1.copy(), p2.copy()
-
-def mutate(ind, rng, pm, min_features):
-    mut = rng.rand(len(ind)) < pm
-    ind[mut] = ~ind[mut]
-    if ind.sum() < min_features:
-        off = np.where(~ind)[0]
-        if len(off) > 0:
-            ind[rng.choice(off)] = True
-    return ind
-
-def run_ga(X_df: pd.DataFrame, y_ser: pd.Series, cfg: GAConfig):
-    t0 = time.time()
-    rng = np.random.RandomState(cfg.random_state)
-    X_arr = X_df.values.astype(float)
-    y_arr = y_ser.values.astype(int)
-    n = X_arr.shape[1]
-
-    pop = rng.rand(cfg.pop_size, n) < 0.5
-    for i in range(cfg.pop_size):
-        if pop[i].sum() < cfg.min_features:
-            pop[i, rng.randint(0, n)] = True
-
-    fit = np.array([fitness(ind, X_arr, y_arr, cfg) for ind in pop])
-    best = pop[np.argmax(fit)].copy()
-    best_fit = float(fit.max())
-    history, no_improve = [], 0
-
-    for g in range(cfg.generations):
-        new = []
-        elite = np.argsort(-fit)[:cfg.elitism]
-        for i in elite:
-            new.append(pop[i].copy())
-        while len(new) < cfg.pop_size:
-            p1 = tournament(pop, fit, rng)
-            p2 = tournament(pop, fit, rng)
-            c1, c2 = crossover(p1, p2, rng, cfg.pc)
-            new += [mutate(c1, rng, cfg.pm, cfg.min_features),
-                    mutate(c2, rng, cfg.pm, cfg.min_features)]
-        pop = np.array(new[:cfg.pop_size])
-        fit = np.array([fitness(ind, X_arr, y_arr, cfg) for ind in pop])
-        gen_best, gen_mean = float(fit.max()), float(fit.mean())
-        history.append({"gen": g, "best": gen_best, "mean": gen_mean})
-
-        if gen_best > best_fit + 1e-12:
-            best_fit = gen_best
-            best = pop[np.argmax(fit)].copy()
-            no_improve = 0
+def mask_key(mask: np.ndarray) -> bytes:
+    return np.packbits(mask, bitorder="little").tobytes()
+
+class FitnessCache:
+    # LRU cache of fitness values; the key also covers every GAConfig field fitness() depends on
+    def __init__(self, cfg: GAConfig):
+        self.maxsize = cfg.cache_size
+        self.context = (cfg.model_name, str(cfg.scorer), cfg.cv_splits, cfg.random_state,
+                        cfg.penalty_lambda, cfg.penalty_n, cfg.min_features)
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes):
+        key = (self.context, key)
+        if key in self.data:
+            self.data.move_to_end(key)
+            self.hits += 1
+            return self.data[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: bytes, value: float):
+        if self.maxsize <= 0:
+            return
+        self.data[(self.context, key)] = value
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+def dataset_fingerprint(X: np.ndarray, y: np.ndarray, chunk_rows: int = 65536) -> str:
+    # content hash of the data, read in row chunks so memory-mapped tables are never loaded whole
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((X.shape, str(X.dtype))).encode())
+    for i in range(0, len(X), chunk_rows):
+        h.update(np.ascontiguousarray(X[i:i + chunk_rows]).tobytes())
+    h.update(np.ascontiguousarray(y).tobytes())
+    return h.hexdigest()
+
+class FitnessStore:
+    # On-disk (SQLite) store of raw mean CV scores shared across runs. Scores are stored before the
+    # size penalty, so runs that differ only in LAMBDA (or any GA setting) still hit. WAL mode plus
+    # BEGIN IMMEDIATE writes make concurrent writers from several processes safe.
+    _CHUNK = 500
+
+    def __init__(self, path: str, max_rows: int = 1_000_000):
+        self.path, self.max_rows = path, max_rows
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS scores (ctx TEXT, mask BLOB, score REAL, atime REAL, "
+                          "PRIMARY KEY (ctx, mask)) WITHOUT ROWID")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS scores_atime ON scores (atime)")
+
+    @staticmethod
+    def context(fingerprint: str, cfg: GAConfig) -> str:
+        parts = (fingerprint, cfg.model_name, str(cfg.scorer), cfg.cv_splits, cfg.random_state, cfg.engine)
+        if cfg.model_name == "ridge":
+            parts += (cfg.ridge_alpha,)
+        if cfg.model_name == "dt" and cfg.dt_bins:  # binned trees score differently from exact ones
+            parts += (cfg.dt_bins,)
+        return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+    def get_many(self, ctx: str, keys) -> dict:
+        keys, found = list(keys), {}
+        for i in range(0, len(keys), self._CHUNK):
+            part = keys[i:i + self._CHUNK]
+            marks = ",".join("?" * len(part))
+            rows = self.conn.execute(f"SELECT mask, score FROM scores WHERE ctx=? AND mask IN ({marks})",
+                                     [ctx, *part]).fetchall()
+            found.update((bytes(m), v) for m, v in rows)
+        if found:
+            now = time.time()
+            self._write("UPDATE scores SET atime=? WHERE ctx=? AND mask=?", [(now, ctx, k) for k in found])
+        return found
+
+    def put_many(self, ctx: str, items):
+        now = time.time()
+        self._write("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)", [(ctx, k, float(v), now) for k, v in items])
+        self.evict()
+
+    def evict(self):
+        # least recently used rows go first, down to 90% of max_rows
+        n = self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        if n > self.max_rows:
+            drop = n - int(self.max_rows * 0.9)
+            self._write("DELETE FROM scores WHERE (ctx, mask) IN "
+                        "(SELECT ctx, mask FROM scores ORDER BY atime LIMIT ?)", [(drop,)])
+
+    def _write(self, sql: str, params):
+        if not params:
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(sql, params)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+# Process-pool workers keep X/y/cfg as module globals; X is opened as a read-only memmap
+# so it is never pickled per task.
+_WORKER = {}
+
+def _init_worker(x_path, y, cfg):
+    _WORKER["X"] = np.load(x_path, mmap_mode="r")
+    _WORKER["y"] = y
+    _WORKER["cfg"] = cfg
+    _WORKER["plan"] = FoldPlan(_WORKER["X"], y, cfg)
+
+def _worker_fold_scores(mask, folds):
+    return timed_fold_scores(mask, _WORKER["X"], _WORKER["y"], _WORKER["cfg"], _WORKER["plan"], folds)
+
+@contextmanager
+def shared_array(X: np.ndarray):
+    # path of an .npy file holding X that other processes can memory-map; reuses X's own file if it has one
+    if isinstance(X, np.memmap) and X.filename and X.filename.endswith(".npy"):
+        yield X.filename
+        return
+    tmp_dir = tempfile.mkdtemp(prefix="ga_shared_")
+    try:
+        path = os.path.join(tmp_dir, "X.npy")
+        np.save(path, np.ascontiguousarray(X))
+        yield path
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+@contextmanager
+def evaluation_pool(X: np.ndarray, y: np.ndarray, cfg: GAConfig):
+    if cfg.evaluator == "serial" or cfg.n_jobs == 1:
+        yield None
+    elif cfg.evaluator == "thread":
+        with ThreadPoolExecutor(max_workers=cfg.n_jobs) as ex:
+            yield ex
+    elif cfg.evaluator == "process":
+        with shared_array(X) as x_path:
+            with ProcessPoolExecutor(max_workers=cfg.n_jobs, initializer=_init_worker,
+                                     initargs=(x_path, y, cfg)) as ex:
+                yield ex
+    else:
+        raise ValueError("Unknown evaluator: "+cfg.evaluator)
+
+def _prediction_metric(scorer):
+    # (metric, kwargs, sign) behind an sklearn scorer, so scores can be computed from predictions alone
+    func = getattr(scorer, "_score_func", None)
+    if func is None or getattr(scorer, "_response_method", "predict") != "predict":
+        raise ValueError("batched engine needs a predict-based sklearn scorer")
+    return func, getattr(scorer, "_kwargs", {}), getattr(scorer, "_sign", 1)
+
+def _batch_metric(metric, kwargs, y_true: np.ndarray, pred: np.ndarray):
+    # metric for every column of pred (n_samples, B) at once; accuracy and binary/macro F1 are
+    # computed from confusion counts, anything else goes through sklearn column by column
+    from sklearn.metrics import accuracy_score, f1_score
+    if metric is accuracy_score and not kwargs:
+        return (pred == y_true[:, None]).mean(axis=0)
+    average = kwargs.get("average", "binary")
+    if metric is f1_score and set(kwargs) <= {"average"} and average in ("binary", "macro"):
+        labels = np.unique(y_true)
+        f1 = []
+        for c in (labels[-1:] if average == "binary" else labels):
+            tp = ((pred == c) & (y_true[:, None] == c)).sum(axis=0)
+            denom = (pred == c).sum(axis=0) + (y_true == c).sum()
+            f1.append(np.where(denom > 0, 2 * tp / np.maximum(denom, 1), 0.0))
+        return np.mean(f1, axis=0)
+    return np.array([metric(y_true, pred[:, b], **kwargs) for b in range(pred.shape[1])])
+
+def _newton_logreg(Z, t, M, W, C=1.0, tol=1e-6, max_iter=50):
+    # Solves liblinear's L2 logistic objective 0.5*|w|^2 + C*sum(log(1+exp(-t*Zw))) for a batch
+    # of masks at once; the intercept is the last (always active, penalized) column of Z.
+    from scipy.special import expit
+    W = W * M
+    active = np.arange(len(W))
+    d = Z.shape[1]
+    # row-wise outer products turn every Hessian of the batch into one GEMM when they fit in memory
+    ZZ = (Z[:, :, None] * Z[:, None, :]).reshape(len(Z), d * d) if len(Z) * d * d <= 2**24 else None
+    # convergence is relative to the gradient norm at w=0, as in liblinear
+    g0 = np.maximum(np.linalg.norm(0.5 * C * (Z.T @ t) * M, axis=1), 1.0)
+    for _ in range(max_iter):
+        if len(active) == 0:
+            break
+        Wa, Ma = W[active], M[active]
+        m = t[:, None] * (Z @ Wa.T)
+        sig = expit(-m)
+        G = (Wa - C * ((t[:, None] * sig).T @ Z)) * Ma
+        done = np.linalg.norm(G, axis=1) <= tol * g0[active]
+        if done.all():
+            break
+        D = sig * (1.0 - sig)
+        if ZZ is not None:
+            H = C * (D.T @ ZZ).reshape(len(active), d, d)
+        else:
+            H = C * ((Z.T[None] * D.T[:, None, :]) @ Z)
+        H = H * (Ma[:, :, None] * Ma[:, None, :]) + np.eye(Z.shape[1])
+        step = np.linalg.solve(H, G[:, :, None])[:, :, 0]
+        loss = 0.5 * (Wa ** 2).sum(1) + C * np.logaddexp(0, -m).sum(0)
+        decrease = (G * step).sum(1)
+        size = np.ones(len(active))
+        for _ in range(20):
+            cand = Wa - size[:, None] * step
+            new_loss = 0.5 * (cand ** 2).sum(1) + C * np.logaddexp(0, -t[:, None] * (Z @ cand.T)).sum(0)
+            bad = new_loss > loss - 1e-4 * size * decrease
+            if not bad.any():
+                break
+            size[bad] *= 0.5
+        W[active] = Wa - size[:, None] * step
+        active = active[~done]
+    return W
+
+class BatchedLogReg:
+    # Scores many logreg masks per fold in one NumPy Newton solve on the FoldPlan-standardized X
+    def __init__(self, X: np.ndarray, y: np.ndarray, cfg: GAConfig, plan: FoldPlan, max_dense: int = 256):
+        self.classes = np.unique(y)
+        if cfg.model_name != "logreg" or len(self.classes) != 2:
+            raise ValueError("batched engine supports binary logreg only")
+        self.metric, self.metric_kwargs, self.sign = _prediction_metric(plan.scorer)
+        self.dense = X.shape[1] + 1 <= max_dense
+        self.X, self.plan, self.seed = X, plan, cfg.random_state
+        self.t = [np.where(yt == self.classes[1], 1.0, -1.0) for yt in plan.y_train]
+        # standardized copies of all columns only when narrow; wide data is fitted per mask in solve
+        self.Z_train, self.Z_test = [], []
+        for j, (tr, te) in enumerate(plan.folds if self.dense else []):
+            ztr, zte = plan.fold_data(X, np.arange(X.shape[1]), j)
+            self.Z_train.append(np.hstack([ztr, np.ones((len(tr), 1))]))
+            self.Z_test.append(np.hstack([zte, np.ones((len(te), 1))]))
+        self.y_test = plan.y_test
+
+    def solve(self, masks: np.ndarray, W0: np.ndarray = None, folds=None, fold_time: np.ndarray = None):
+        # masks (B, n) bool, W0 (B, n_folds, n+1) warm start. Returns scores (B, len(folds)) and the
+        # coefficients. Wide data falls back to liblinear mask by mask (a cold Newton solve on each mask's
+        # columns would be slower than it) and returns no coefficients.
+        B, n = masks.shape
+        folds = range(len(self.t)) if folds is None else folds
+        M = np.hstack([masks, np.ones((B, 1), bool)])
+        scores = np.empty((B, len(folds)))
+        fold_time = np.zeros(len(self.t)) if fold_time is None else fold_time
+        if not self.dense:
+            for b in range(B):
+                cols = np.flatnonzero(masks[b])
+                for i, j in enumerate(folds):
+                    t0 = time.perf_counter()
+                    ztr, zte = self.plan.fold_data(self.X, cols, j)
+                    model = make_estimator("logreg", self.seed).fit(ztr, self.plan.y_train[j])
+                    scores[b, i] = self._score(j, model.decision_function(zte)[:, None])[0]
+                    fold_time[j] += time.perf_counter() - t0
+            return scores, None
+        W = np.zeros((B, len(self.Z_train), n + 1)) if W0 is None else W0 * M[:, None, :]
+        for i, j in enumerate(folds):
+            t0 = time.perf_counter()
+            W[:, j] = _newton_logreg(self.Z_train[j], self.t[j], M.astype(float), W[:, j])
+            scores[:, i] = self._score(j, self.Z_test[j] @ W[:, j].T)
+            fold_time[j] += time.perf_counter() - t0
+        return scores, W
+
+    def empty_state(self, B: int):
+        return np.zeros((B, len(self.t), self.X.shape[1] + 1))
+
+    def inherit(self, W: np.ndarray, masks: np.ndarray):
+        # parent coefficients restricted to the child's columns (the intercept always stays)
+        return W * np.hstack([masks, np.ones((len(masks), 1), bool)])[:, None, :]
+
+    def _score(self, j: int, decision: np.ndarray):
+        pred = self.classes[(decision > 0).astype(int)]
+        return self.sign * _batch_metric(self.metric, self.metric_kwargs, self.y_test[j], pred)
+
+class BatchedRidge:
+    # RidgeClassifier (targets +-1, centered intercept) on the FoldPlan-standardized X, solved from
+    # per-fold Gram matrices. The state of a mask is, per fold, the inverse of G_SS + alpha*I embedded
+    # in (n, n) with zeros outside S. A child within max_flips bits of its parent's state gets its
+    # inverse by rank-one remove/add updates (O(n^2) per bit) instead of a fresh inversion. The states
+    # are dense (pop, folds, n, n), so the engine only keeps them while those of 2 * pop_size masks (nsga2
+    # survival holds parents and children) fit in max_state_mb; they are not checkpointed either.
+    def __init__(self, X: np.ndarray, y: np.ndarray, cfg: GAConfig, plan: FoldPlan, max_dense: int = 128,
+                 max_flips: int = 3, max_state_mb: int = 256):
+        self.classes = np.unique(y)
+        if cfg.model_name != "ridge" or len(self.classes) != 2:
+            raise ValueError("batched ridge engine supports binary ridge only")
+        self.metric, self.metric_kwargs, self.sign = _prediction_metric(plan.scorer)
+        self.alpha, self.max_flips = cfg.ridge_alpha, max_flips
+        state_mb = 2 * cfg.pop_size * len(plan) * X.shape[1] ** 2 * 8 / (1 << 20)
+        self.dense = X.shape[1] <= max_dense and state_mb <= max_state_mb
+        self.X, self.plan = X, plan
+        self.t = [np.where(yt == self.classes[1], 1.0, -1.0) for yt in plan.y_train]
+        self.t_mean = [t.mean() for t in self.t]
+        # (n, n) Grams only when narrow; wide data builds the Gram of each mask's own columns in solve
+        self.G, self.b, self.Z_test = [], [], []
+        for j in range(len(plan) if self.dense else 0):
+            ztr, zte = plan.fold_data(X, np.arange(X.shape[1]), j)
+            self.G.append(ztr.T @ ztr)
+            self.b.append(ztr.T @ (self.t[j] - self.t_mean[j]))
+            self.Z_test.append(zte)
+        self.y_test = plan.y_test
+        self.n_incremental = 0  # (mask, fold) solves done by rank-one updates
+
+    def empty_state(self, B: int):
+        n = self.X.shape[1]
+        return np.zeros((B, len(self.t), n, n))
+
+    def inherit(self, P: np.ndarray, masks: np.ndarray):
+        return P
+
+    def solve(self, masks: np.ndarray, W0: np.ndarray = None, folds=None, fold_time: np.ndarray = None):
+        # same contract as BatchedLogReg.solve, with the embedded inverses as the returned state
+        B, n = masks.shape
+        folds = range(len(self.t)) if folds is None else folds
+        scores = np.empty((B, len(folds)))
+        fold_time = np.zeros(len(self.t)) if fold_time is None else fold_time
+        if not self.dense:
+            for b in range(B):
+                cols = np.flatnonzero(masks[b])
+                for i, j in enumerate(folds):
+                    t0 = time.perf_counter()
+                    ztr, zte = self.plan.fold_data(self.X, cols, j)
+                    A = ztr.T @ ztr + self.alpha * np.eye(len(cols))
+                    w = np.linalg.solve(A, ztr.T @ (self.t[j] - self.t_mean[j]))
+                    scores[b, i] = self._score(j, (zte @ w + self.t_mean[j])[:, None])[0]
+                    fold_time[j] += time.perf_counter() - t0
+            return scores, None
+        P = self.empty_state(B) if W0 is None else W0.copy()
+        for i, j in enumerate(folds):
+            t0 = time.perf_counter()
+            P[:, j] = self._inverse(j, masks, P[:, j])
+            w = P[:, j] @ self.b[j]
+            scores[:, i] = self._score(j, self.Z_test[j] @ w.T + self.t_mean[j])
+            fold_time[j] += time.perf_counter() - t0
+        return scores, P
+
+    def _inverse(self, j: int, masks: np.ndarray, P: np.ndarray):
+        held = np.diagonal(P, axis1=1, axis2=2) > 0  # the mask each state is the inverse for
+        flips = held != masks
+        n_flips = flips.sum(axis=1)
+        fresh = n_flips > self.max_flips
+        if fresh.any():
+            m = masks[fresh]
+            A = (self.G[j] + self.alpha * np.eye(masks.shape[1])) * (m[:, :, None] & m[:, None, :])
+            A[:, np.arange(m.shape[1]), np.arange(m.shape[1])] += ~m
+            P[fresh] = np.linalg.inv(A) * (m[:, :, None] & m[:, None, :])
+        inc = ~fresh & (n_flips > 0)
+        self.n_incremental += int(inc.sum())
+        # flipped bits in order: removals first, then additions
+        order = np.argsort(np.where(flips, masks, 2), axis=1, kind="stable")
+        for step in range(int(n_flips[inc].max()) if inc.any() else 0):
+            rows = np.flatnonzero(inc & (n_flips > step))
+            k = order[rows, step]
+            add = masks[rows, k]
+            if (~add).any():
+                P[rows[~add]] = self._remove(P[rows[~add]], k[~add])
+            if add.any():
+                P[rows[add]] = self._add(j, P[rows[add]], k[add])
+        return P
+
+    @staticmethod
+    def _remove(P: np.ndarray, k: np.ndarray):
+        a = np.arange(len(k))
+        col, row = P[a, :, k], P[a, k, :]
+        P = P - col[:, :, None] * row[:, None, :] / P[a, k, k][:, None, None]
+        P[a, k, :] = 0.0
+        P[a, :, k] = 0.0
+        return P
+
+    def _add(self, j: int, P: np.ndarray, k: np.ndarray):
+        a = np.arange(len(k))
+        held = np.diagonal(P, axis1=1, axis2=2) > 0
+        u = self.G[j][k] * held
+        v = np.einsum("bkl,bl->bk", P, u)
+        s = self.G[j][k, k] + self.alpha - (u * v).sum(axis=1)
+        P = P + v[:, :, None] * v[:, None, :] / s[:, None, None]
+        P[a, :, k] = -v / s[:, None]
+        P[a, k, :] = -v / s[:, None]
+        P[a, k, k] = 1.0 / s
+        return P
+
+    def _score(self, j: int, decision: np.ndarray):
+        pred = self.classes[(decision > 0).astype(int)]
+        return self.sign * _batch_metric(self.metric, self.metric_kwargs, self.y_test[j], pred)
+
+def make_engine(X: np.ndarray, y: np.ndarray, cfg: GAConfig, plan: FoldPlan):
+    if cfg.engine != "batched":
+        return None
+    return (BatchedRidge if cfg.model_name == "ridge" else BatchedLogReg)(X, y, cfg, plan)
+
+class Surrogate:
+    # Online ridge model of fitness over the mask bits plus the selected fraction
+    def __init__(self, cfg: GAConfig, n_features: int):
+        self.cfg = cfg
+        self.n = n_features
+        self.X, self.y = [], []
+        self.model = None
+
+    def _design(self, masks):
+        masks = np.asarray(masks, dtype=float).reshape(-1, self.n)
+        return np.hstack([masks, masks.mean(axis=1, keepdims=True)])
+
+    def add(self, masks, values):
+        ok = np.isfinite(values)
+        self.X.extend(np.asarray(masks)[ok])
+        self.y.extend(np.asarray(values)[ok])
+        limit = self.cfg.surrogate_archive
+        if len(self.y) > limit:
+            del self.X[:-limit], self.y[:-limit]
+        self.model = None
+
+    def ready(self):
+        return len(self.y) >= self.cfg.surrogate_min_samples
+
+    def predict(self, masks):
+        if self.model is None:
+            from sklearn.linear_model import Ridge
+            self.model = Ridge(alpha=self.cfg.surrogate_alpha).fit(self._design(self.X), np.array(self.y))
+        return self.model.predict(self._design(masks))
+
+def _rank_corr(a, b):
+    if len(a) < 3:
+        return np.nan
+    ra, rb = np.argsort(np.argsort(a)), np.argsort(np.argsort(b))
+    if ra.std() == 0 or rb.std() == 0:
+        return np.nan
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+class PopulationEvaluator:
+    # Owns everything a population evaluation needs: fold plan, fitness cache, executor, optional engine
+    def __init__(self, X: np.ndarray, y: np.ndarray, cfg: GAConfig, executor=None, plan: FoldPlan = None):
+        # plan may be shared between evaluators on the same X, y, cv_splits, random_state, model and scorer
+        self.X, self.y, self.cfg = X, y, cfg
+        self.plan = FoldPlan(X, y, cfg) if plan is None else plan
+        self.cache = FitnessCache(cfg)
+        self.executor = executor
+        self.engine = make_engine(X, y, cfg, self.plan)
+        self.coefs = None
+        self.folds_used = None
+        self.surrogate = Surrogate(cfg, X.shape[1]) if cfg.surrogate else None
+        self.estimated = None
+        self.surrogate_corr = np.nan
+        self.store = FitnessStore(cfg.store_path, cfg.store_max_rows) if cfg.store_path else None
+        self._fingerprint = None
+        self.store_ctx = FitnessStore.context(self.fingerprint(), cfg) if self.store is not None else None
+        self.store_hits = 0
+        self.fold_time = np.zeros(len(self.plan))
+        self.n_unique = self.n_evaluated = 0
+        # last call, disjoint: fits + cached + store hits + estimated masks + infeasible + duplicate rows = pop size
+        self.n_cached = self.n_infeasible = self.n_duplicate = self.n_estimated = 0
+        self.fit_times = {} if cfg.selection == "nsga2" else None  # mask key -> seconds for its CV
+        self.mask_time = None
+
+    def __call__(self, pop, origin: np.ndarray = None):
+        # origin[i] is the row of the previous population that individual i descends from
+        cfg = self.cfg
+        fit = np.empty(len(pop))
+        pending = {}
+        packed = isinstance(pop, PackedPopulation)
+        keys = pop.keys() if packed else [mask_key(ind) for ind in pop]
+        counts = pop.counts() if packed else pop.sum(axis=1)
+        n_penalty = cfg.penalty_n or self.X.shape[1]
+        self.n_unique = len(set(keys))
+        self.fold_time = np.zeros(len(self.plan))
+        self.n_cached = self.n_infeasible = self.n_duplicate = self.n_estimated = 0
+        for i, key in enumerate(keys):
+            if counts[i] < cfg.min_features:
+                fit[i] = -np.inf
+                self.n_infeasible += 1
+                continue
+            if key in pending:
+                pending[key].append(i)
+                self.n_duplicate += 1
+                continue
+            value = self.cache.get(key)
+            if value is None:
+                pending[key] = [i]
+            else:
+                fit[i] = value
+                self.n_cached += 1
+        self.store_hits = 0
+        if self.store is not None and pending:
+            for key, score in self.store.get_many(self.store_ctx, pending).items():
+                idx = pending.pop(key)
+                value = float(score - cfg.penalty_lambda * counts[idx[0]] / n_penalty)
+                self.cache.put(key, value)
+                fit[idx] = value
+                self.store_hits += 1
+        self.estimated = np.zeros(len(pop), dtype=bool)
+        predicted = None
+        if self.surrogate is not None and self.surrogate.ready() and pending:
+            # only the top surrogate-ranked fraction of uncached masks is truly evaluated
+            keys_all = list(pending)
+            predicted = self.surrogate.predict([pop[pending[k][0]] for k in keys_all])
+            n_true = int(np.ceil(cfg.surrogate_budget * len(keys_all)))
+            order = np.argsort(-predicted, kind="stable")
+            for r in order[n_true:]:
+                fit[pending[keys_all[r]]] = predicted[r]
+                self.estimated[pending[keys_all[r]]] = True
+            self.n_estimated = len(order) - n_true
+            keep = sorted(order[:n_true])
+            pending = {keys_all[r]: pending[keys_all[r]] for r in keep}
+            predicted = predicted[keep]
+        rows = [idx[0] for idx in pending.values()]
+        masks = [pop[i] for i in rows]
+        self.n_evaluated = len(rows)
+        if self.engine is not None and self.engine.dense:
+            self._warm_start(pop, origin)
+        penalty = cfg.penalty_lambda * counts[rows] / n_penalty
+        if cfg.racing:
+            # the threshold only comes from exact fitness: no pending rows, no surrogate estimates
+            exact = ~self.estimated
+            exact[[i for idx in pending.values() for i in idx]] = False
+            known = fit[exact]
+            scores, used = self._race(rows, masks, penalty, known[np.isfinite(known)])
+        else:
+            scores = self._fold_scores(rows, masks, range(len(self.plan))).mean(axis=1)
+            used = np.full(len(rows), len(self.plan))
+        self.folds_used = np.zeros(len(pop), dtype=int)
+        for (key, idx), value, n_used in zip(pending.items(), scores - penalty, used):
+            # raced-out individuals carry a partial estimate, which is never cached
+            if n_used == len(self.plan):
+                self.cache.put(key, float(value))
+            fit[idx] = value
+            self.folds_used[idx[0]] = n_used
+        if self.fit_times is not None and self.mask_time is not None:
+            for key, t in zip(pending, self.mask_time):
+                self.fit_times[key] = float(t)  # a re-evaluation (after eviction or a resume) replaces it
+        if self.store is not None:
+            self.store.put_many(self.store_ctx, [(key, score) for key, score, n_used in zip(pending, scores, used)
+                                                 if n_used == len(self.plan)])
+        if self.surrogate is not None and rows:
+            exact = used == len(self.plan)
+            values = scores - penalty
+            self.surrogate_corr = np.nan if predicted is None else _rank_corr(predicted[exact], values[exact])
+            self.surrogate.add(np.array(masks)[exact], values[exact])
+        return fit
+
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = dataset_fingerprint(self.X, self.y)
+        return self._fingerprint
+
+    def _fold_scores(self, rows, masks, folds):
+        folds = list(folds)
+        if not masks:
+            return np.empty((0, len(folds)))
+        if self.engine is not None:
+            W0 = None if self.coefs is None else self.coefs[rows]
+            before = self.fold_time.sum()
+            scores, W = self.engine.solve(np.array(masks), W0, folds, self.fold_time)
+            if W is not None and self.coefs is not None:
+                self.coefs[rows] = W
+            self.mask_time = np.full(len(masks), (self.fold_time.sum() - before) / len(masks))
+            return scores
+        cfg = self.cfg
+        if self.executor is None:
+            results = [timed_fold_scores(m, self.X, self.y, cfg, self.plan, folds) for m in masks]
+        elif isinstance(self.executor, ProcessPoolExecutor):
+            chunk = max(1, len(masks) // (4 * cfg.n_jobs))
+            results = list(self.executor.map(_worker_fold_scores, masks, [folds] * len(masks), chunksize=chunk))
         else:
-            no_improve += 1
+            results = list(self.executor.map(
+                lambda m: timed_fold_scores(m, self.X, self.y, cfg, self.plan, folds), masks))
+        self.fold_time[folds] += np.sum([t for _, t in results], axis=0)
+        self.mask_time = np.array([sum(t) for _, t in results])
+        return np.array([sc for sc, _ in results])
+
+    def _race(self, rows, masks, penalty, known):
+        # Score fold by fold; drop a candidate once even perfect scores (1.0) on its remaining folds
+        # could not lift it above the k-th best complete fitness, k = max(1, elitism).
+        k_folds = len(self.plan)
+        kth = max(1, self.cfg.elitism)
+        sums = np.zeros(len(rows))
+        used = np.zeros(len(rows), dtype=int)
+        alive = np.arange(len(rows))
+        for j in range(k_folds):
+            if len(alive) == 0:
+                break
+            sums[alive] += self._fold_scores([rows[i] for i in alive], [masks[i] for i in alive], [j])[:, 0]
+            used[alive] += 1
+            if j == k_folds - 1:
+                break
+            done = used == k_folds
+            complete = np.r_[known, sums[done] / k_folds - penalty[done]]
+            if len(complete) < kth:
+                continue
+            threshold = np.sort(complete)[-kth]
+            bound = (sums[alive] + (k_folds - 1 - j)) / k_folds - penalty[alive]
+            alive = alive[bound >= threshold]
+        return sums / np.maximum(used, 1), used
+
+    def _warm_start(self, pop, origin):
+        # every child starts from its parent's per-fold engine state (logreg coefficients, ridge inverses)
+        all_masks = pop.to_bool() if isinstance(pop, PackedPopulation) else np.asarray(pop)
+        if self.coefs is not None and origin is not None:
+            self.coefs = self.engine.inherit(self.coefs[origin], all_masks)
+        else:
+            self.coefs = self.engine.empty_state(len(all_masks))
+
+# Batched GA operators: each works on the whole (pop_size, n_features) boolean matrix at once.
+def select_parents(fit: np.ndarray, n: int, rng, k: int = 3):
+    idx = rng.integers(0, len(fit), size=(n, k))
+    return idx[np.arange(n), np.argmax(fit[idx], axis=1)]
+
+def crossover_pairs(p1: np.ndarray, p2: np.ndarray, rng, pc: float, kind: str = "one_point"):
+    m, n = p1.shape
+    do = rng.random(m) < pc
+    ar = np.arange(n)
+    if kind == "one_point":
+        take = ar < rng.integers(1, n, size=m)[:, None] if n > 1 else np.ones((m, n), bool)
+    elif kind == "two_point":
+        pts = np.sort(rng.integers(1, max(n, 2), size=(m, 2)), axis=1)
+        take = (ar < pts[:, :1]) | (ar >= pts[:, 1:])
+    elif kind == "uniform":
+        take = rng.random((m, n)) < 0.5
+    else:
+        raise ValueError("Unknown crossover: "+kind)
+    take[~do] = True
+    return np.where(take, p1, p2), np.where(take, p2, p1)
+
+def mutate_pop(pop: np.ndarray, rng, pm: float):
+    pop ^= rng.random(pop.shape) < pm
+    return pop
+
+def repair_min_features(pop: np.ndarray, rng, min_features: int):
+    deficit = min_features - pop.sum(axis=1)
+    rows = np.where(deficit > 0)[0]
+    if len(rows):
+        keys = rng.random((len(rows), pop.shape[1]))
+        keys[pop[rows]] = np.inf
+        rank = np.argsort(np.argsort(keys, axis=1), axis=1)
+        pop[rows] |= rank < deficit[rows, None]
+    return pop
+
+def next_generation(pop: np.ndarray, fit: np.ndarray, rng, cfg: GAConfig):
+    elite = np.argsort(-fit)[:cfg.elitism]
+    n_children = cfg.pop_size - len(elite)
+    n_pairs = (n_children + 1) // 2
+    parents = select_parents(fit, 2 * n_pairs, rng, cfg.tournament_k).reshape(n_pairs, 2)
+    c1, c2 = crossover_pairs(pop[parents[:, 0]], pop[parents[:, 1]], rng, cfg.pc, cfg.crossover)
+    children = np.empty((2 * n_pairs, pop.shape[1]), dtype=bool)
+    children[0::2], children[1::2] = c1, c2
+    children = mutate_pop(children[:n_children], rng, cfg.pm)
+    children = repair_min_features(children, rng, cfg.min_features)
+    origin = np.r_[elite, parents.reshape(-1)[:n_children]]
+    return np.vstack([pop[elite], children]), origin
+
+WORD = np.dtype("<u8")
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+_POPCOUNT8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+def _popcount(words: np.ndarray):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT8[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+class PackedPopulation:
+    # Population stored as little-endian uint64 words, bit j of a row = feature j; padding bits stay zero
+    def __init__(self, words: np.ndarray, n_features: int):
+        self.words = np.ascontiguousarray(words, dtype=WORD)
+        self.n_features = n_features
+        self.n_bytes = (n_features + 7) // 8
+
+    @classmethod
+    def from_bool(cls, pop: np.ndarray):
+        pop = np.atleast_2d(pop)
+        n_words = (pop.shape[1] + 63) // 64
+        padded = np.zeros((len(pop), n_words * 64), dtype=bool)
+        padded[:, :pop.shape[1]] = pop
+        return cls(np.packbits(padded, axis=1, bitorder="little").view(WORD), pop.shape[1])
+
+    def to_bool(self):
+        bits = np.unpackbits(self.words.view(np.uint8), axis=1, bitorder="little")
+        return bits[:, :self.n_features].astype(bool)
+
+    @property
+    def shape(self):
+        return (len(self.words), self.n_features)
+
+    @property
+    def tail_mask(self):
+        r = self.n_features % 64
+        return _ALL_ONES if r == 0 else np.uint64((1 << r) - 1)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, idx):
+        if np.isscalar(idx):
+            bits = np.unpackbits(self.words[idx].view(np.uint8), bitorder="little")
+            return bits[:self.n_features].astype(bool)
+        return PackedPopulation(self.words[idx], self.n_features)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def counts(self):
+        return _popcount(self.words)
+
+    def keys(self):
+        # byte-identical to mask_key() of the unpacked rows
+        raw = self.words.view(np.uint8)[:, :self.n_bytes]
+        return [row.tobytes() for row in raw]
+
+def _prefix_words(points: np.ndarray, n_words: int):
+    # words with the first `points[i]` bits set, per row
+    shift = np.clip(points[:, None] - 64 * np.arange(n_words)[None, :], 0, 64).astype(np.uint64)
+    part = (np.uint64(1) << np.minimum(shift, np.uint64(63))) - np.uint64(1)
+    return np.where(shift >= 64, _ALL_ONES, part)
+
+def random_packed(m: int, n: int, rng):
+    pop = PackedPopulation(rng.integers(0, 2**64, size=(m, (n + 63) // 64), dtype=np.uint64), n)
+    pop.words[:, -1] &= pop.tail_mask
+    return pop
+
+def crossover_packed(p1: np.ndarray, p2: np.ndarray, n: int, rng, pc: float, kind: str = "one_point"):
+    m, n_words = p1.shape
+    do = rng.random(m) < pc
+    if kind == "one_point":
+        take = _prefix_words(rng.integers(1, max(n, 2), size=m), n_words)
+    elif kind == "two_point":
+        pts = np.sort(rng.integers(1, max(n, 2), size=(m, 2)), axis=1)
+        take = _prefix_words(pts[:, 0], n_words) | ~_prefix_words(pts[:, 1], n_words)
+    elif kind == "uniform":
+        take = rng.integers(0, 2**64, size=(m, n_words), dtype=np.uint64)
+    else:
+        raise ValueError("Unknown crossover: "+kind)
+    take[~do] = _ALL_ONES
+    return (p1 & take) | (p2 & ~take), (p2 & take) | (p1 & ~take)
+
+def mutate_packed(pop: PackedPopulation, rng, pm: float):
+    # sample only the flipped positions and XOR them in word by word: a binomial count per row, then that
+    # many distinct positions (duplicates are redrawn), so each bit flips with probability pm as in mutate_pop
+    n, n_words = pop.n_features, pop.words.shape[1]
+    n_flips = rng.binomial(n, pm, size=len(pop))
+    flat, need = np.empty(0, dtype=np.int64), n_flips
+    while need.any():
+        rows = np.repeat(np.arange(len(pop)), need)
+        flat = np.unique(np.r_[flat, rows * n + rng.integers(0, n, size=need.sum())])
+        need = n_flips - np.bincount(flat // n, minlength=len(pop))
+    if len(flat) == 0:
+        return pop
+    rows, pos = flat // n, flat % n
+    word = rows * n_words + pos // 64
+    bits = np.uint64(1) << (pos % 64).astype(np.uint64)
+    starts = np.r_[0, np.flatnonzero(np.diff(word)) + 1]
+    pop.words.reshape(-1)[word[starts]] ^= np.bitwise_or.reduceat(bits, starts)
+    return pop
+
+def repair_packed(pop: PackedPopulation, rng, min_features: int):
+    rows = np.where(pop.counts() < min_features)[0]
+    if len(rows):
+        fixed = repair_min_features(pop[rows].to_bool(), rng, min_features)
+        pop.words[rows] = PackedPopulation.from_bool(fixed).words
+    return pop
 
-        if cfg.early_stop and no_improve >= cfg.patience:
+def next_generation_packed(pop: PackedPopulation, fit: np.ndarray, rng, cfg: GAConfig):
+    elite = np.argsort(-fit)[:cfg.elitism]
+    n_children = cfg.pop_size - len(elite)
+    n_pairs = (n_children + 1) // 2
+    parents = select_parents(fit, 2 * n_pairs, rng, cfg.tournament_k).reshape(n_pairs, 2)
+    c1, c2 = crossover_packed(pop.words[parents[:, 0]], pop.words[parents[:, 1]], pop.n_features,
+                              rng, cfg.pc, cfg.crossover)
+    children = np.empty((2 * n_pairs, c1.shape[1]), dtype=WORD)
+    children[0::2], children[1::2] = c1, c2
+    children = PackedPopulation(children[:n_children], pop.n_features)
+    children.words[:, -1] &= children.tail_mask
+    children = repair_packed(mutate_packed(children, rng, cfg.pm), rng, cfg.min_features)
+    origin = np.r_[elite, parents.reshape(-1)[:n_children]]
+    return PackedPopulation(np.vstack([pop.words[elite], children.words]), pop.n_features), origin
+
+# NSGA-II: objectives are (CV score, -n_features), both maximised; fronts and crowding are vectorized.
+def objectives(pop, fit: np.ndarray, cfg: GAConfig):
+    # the CV score is recovered from the penalised fitness; infeasible masks sit below every score
+    counts = pop.counts() if isinstance(pop, PackedPopulation) else np.asarray(pop).sum(axis=1)
+    n = cfg.penalty_n or (pop.n_features if isinstance(pop, PackedPopulation) else np.shape(pop)[1])
+    score = np.where(np.isfinite(fit), fit + cfg.penalty_lambda * counts / n, -1.0)
+    return np.column_stack([score, -counts.astype(float)])
+
+def non_dominated_sort(F: np.ndarray):
+    # rank 0 is the Pareto front; one numpy pass per front over the (N, N) domination matrix
+    ge = (F[:, None, :] >= F[None, :, :]).all(axis=2)
+    gt = (F[:, None, :] > F[None, :, :]).any(axis=2)
+    dom = ge & gt  # dom[i, j]: i dominates j
+    n_dominators = dom.sum(axis=0)
+    rank = np.full(len(F), -1)
+    r = 0
+    while (rank < 0).any():
+        front = (rank < 0) & (n_dominators == 0)
+        rank[front] = r
+        n_dominators = n_dominators - dom[front].sum(axis=0)
+        n_dominators[front] = -1
+        r += 1
+    return rank
+
+def crowding_distance(F: np.ndarray, rank: np.ndarray):
+    N = len(F)
+    dist = np.zeros(N)
+    idx = np.arange(N)
+    for k in range(F.shape[1]):
+        order = np.lexsort((F[:, k], rank))
+        f, r = F[order, k], rank[order]
+        first = np.r_[True, r[1:] != r[:-1]]
+        last = np.r_[r[1:] != r[:-1], True]
+        lo = np.maximum.accumulate(np.where(first, idx, 0))
+        hi = np.minimum.accumulate(np.where(last, idx, N)[::-1])[::-1]
+        span = f[hi] - f[lo]
+        gap = np.r_[0.0, f[2:] - f[:-2], 0.0] if N > 2 else np.zeros(N)
+        d = np.where(span > 0, gap / np.where(span > 0, span, 1.0), 0.0)
+        d[first | last] = np.inf
+        dist[order] += d
+    return dist
+
+def crowded_order(F: np.ndarray):
+    # indices best-first: lower front rank, then larger crowding distance
+    rank = non_dominated_sort(F)
+    return np.lexsort((-crowding_distance(F, rank), rank)), rank
+
+def next_generation_nsga(pop, fit: np.ndarray, rng, cfg: GAConfig):
+    # children only (the survivors are chosen after evaluation); tournaments compare crowded order
+    order, _ = crowded_order(objectives(pop, fit, cfg))
+    key = np.empty(len(order))
+    key[order] = -np.arange(len(order))
+    step = next_generation_packed if isinstance(pop, PackedPopulation) else next_generation
+    return step(pop, key, rng, replace(cfg, elitism=0))
+
+def concat_populations(a, b):
+    if isinstance(a, PackedPopulation):
+        return PackedPopulation(np.vstack([a.words, b.words]), a.n_features)
+    return np.vstack([a, b])
+
+def pareto_front(pop, fit: np.ndarray, cfg: GAConfig, fit_times: dict = None):
+    # DataFrame of the distinct rank-0 masks: mask, score, n_features, fit_time (seconds per CV, NaN if unknown)
+    F = objectives(pop, fit, cfg)
+    rank = non_dominated_sort(F)
+    rows, seen = [], set()
+    for i in np.flatnonzero((rank == 0) & np.isfinite(fit)):
+        mask = np.asarray(pop[i], dtype=bool)
+        key = mask_key(mask)
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.append({"mask": mask, "score": float(F[i, 0]), "n_features": int(-F[i, 1]),
+                     "fit_time": (fit_times or {}).get(key, np.nan)})
+    front = pd.DataFrame(rows, columns=["mask", "score", "n_features", "fit_time"])
+    return front.sort_values(["n_features", "score"], ascending=[True, False]).reset_index(drop=True)
+
+CHECKPOINT_VERSION = 3
+# GAConfig fields a run may change when it resumes; every other field and the data must match
+_RESUMABLE_FIELDS = {"generations", "early_stop", "patience", "checkpoint_path", "checkpoint_every",
+                     "checkpoint_seconds", "evaluator", "n_jobs", "trace_path", "store_path", "store_max_rows"}
+
+def checkpoint_key(cfg: GAConfig, fingerprint: str) -> str:
+    parts = [(f.name, str(getattr(cfg, f.name))) for f in fields(cfg) if f.name not in _RESUMABLE_FIELDS]
+    return hashlib.blake2b(repr((fingerprint, parts)).encode(), digest_size=16).hexdigest()
+
+def save_checkpoint(path: str, gen: int, pop, fit, best, best_fit, no_improve, history, seed_seq,
+                    evaluator: PopulationEvaluator):
+    # Everything run_ga needs to continue bit-for-bit: population (packed), fitness, the run's
+    # SeedSequence (later generations derive their streams from it), history and the evaluator
+    # state that decides which masks are truly evaluated.
+    packed = isinstance(pop, PackedPopulation)
+    words = pop.words if packed else PackedPopulation.from_bool(pop).words
+    cache = evaluator.cache
+    arrays = {
+        "version": CHECKPOINT_VERSION, "gen": gen, "packed": packed, "n_features": evaluator.X.shape[1],
+        "key": checkpoint_key(evaluator.cfg, evaluator.fingerprint()),
+        "pop_words": words, "fit": fit, "best": best, "best_fit": best_fit, "no_improve": no_improve,
+        "history": json.dumps(history),
+        "seed_entropy": json.dumps(seed_seq.entropy), "seed_spawn_key": np.array(seed_seq.spawn_key, dtype=np.int64),
+        "cache_keys": np.array([np.frombuffer(k, np.uint8) for _, k in cache.data], dtype=np.uint8)
+                      .reshape(len(cache.data), (evaluator.X.shape[1] + 7) // 8),
+        "cache_values": np.array(list(cache.data.values()), dtype=float),
+        "cache_counts": np.array([cache.hits, cache.misses]),
+    }
+    if evaluator.surrogate is not None:
+        arrays["surrogate_X"] = np.array(evaluator.surrogate.X, dtype=bool).reshape(-1, evaluator.X.shape[1])
+        arrays["surrogate_y"] = np.array(evaluator.surrogate.y, dtype=float)
+    if evaluator.coefs is not None and not isinstance(evaluator.engine, BatchedRidge):
+        arrays["coefs"] = evaluator.coefs  # ridge inverses are large and rebuilt on the next solve
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp, path)
+
+def load_checkpoint(path: str, evaluator: PopulationEvaluator):
+    # restores the evaluator in place and returns the loop state saved by save_checkpoint
+    ck = np.load(path)
+    if int(ck["version"]) != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {int(ck['version'])} in {path}")
+    n = int(ck["n_features"])
+    if n != evaluator.X.shape[1]:
+        raise ValueError(f"Checkpoint has {n} features, data has {evaluator.X.shape[1]}")
+    if str(ck["key"]) != checkpoint_key(evaluator.cfg, evaluator.fingerprint()):
+        raise ValueError(f"Checkpoint {path} was written for other data or settings; only "
+                         + ", ".join(sorted(_RESUMABLE_FIELDS)) + " may change on resume")
+    cache = evaluator.cache
+    cache.data = OrderedDict(((cache.context, k.tobytes()), float(v))
+                             for k, v in zip(ck["cache_keys"], ck["cache_values"]))
+    cache.hits, cache.misses = (int(c) for c in ck["cache_counts"])
+    if evaluator.surrogate is not None and "surrogate_y" in ck:
+        evaluator.surrogate.X = list(ck["surrogate_X"])
+        evaluator.surrogate.y = list(ck["surrogate_y"])
+    if "coefs" in ck:
+        evaluator.coefs = ck["coefs"]
+    pop = PackedPopulation(ck["pop_words"], n)
+    return {"gen": int(ck["gen"]), "pop": pop if bool(ck["packed"]) else pop.to_bool(),
+            "fit": ck["fit"], "best": ck["best"], "best_fit": float(ck["best_fit"]),
+            "no_improve": int(ck["no_improve"]), "history": json.loads(str(ck["history"])),
+            "seed_seq": np.random.SeedSequence(json.loads(str(ck["seed_entropy"])),
+                                               spawn_key=tuple(int(k) for k in ck["seed_spawn_key"]))}
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10  # bytes on macOS, KiB on Linux
+
+def population_diversity(pop):
+    # mean pairwise Hamming distance, from the per-feature counts of selected bits
+    pop = pop.to_bool() if isinstance(pop, PackedPopulation) else np.asarray(pop, dtype=bool)
+    P = len(pop)
+    if P < 2:
+        return 0.0
+    c = pop.sum(axis=0, dtype=np.int64)
+    return float((2 * c * (P - c)).sum() / (P * (P - 1)))
+
+def adapt_operators(pop, fit: np.ndarray, cfg: GAConfig):
+    # pm/pc for the next generation from the state of the current one. The pressure is how far the
+    # population is below the diversity target (mean pairwise Hamming distance / n_features) or the
+    # fitness-std target, whichever is further: pm grows with it up to pm_max and pc shrinks towards
+    # pc_min, since crossing near-identical parents only produces clones. At or above both targets
+    # the configured pm/pc are used.
+    diversity = population_diversity(pop) / max(1, pop.shape[1])
+    finite = fit[np.isfinite(fit)]
+    fit_std = float(finite.std()) if len(finite) else 0.0
+    pressure = max(1.0, cfg.diversity_target / max(diversity, 1e-12), cfg.fitness_std_target / max(fit_std, 1e-12))
+    pm = min(max(cfg.pm, cfg.pm_max), cfg.pm * pressure)
+    pc = max(min(cfg.pc, cfg.pc_min), cfg.pc / pressure)
+    return pm, pc, {"pm": pm, "pc": pc, "diversity": diversity, "fit_std": fit_std}
+
+def reseed_around(best: np.ndarray, m: int, rng, flip: float, min_features: int):
+    # m masks around best: each bit flipped with probability flip
+    masks = np.asarray(best, dtype=bool)[None, :] ^ (rng.random((m, len(best))) < flip)
+    return repair_min_features(masks, rng, min_features)
+
+class TraceRecorder:
+    # GARun callback writing one JSON line per generation: the history record plus run.stats
+    def __init__(self, path: str, **extra):
+        self.path, self.extra = path, extra
+        self.f = None
+
+    def on_generation_end(self, run, gen, record):
+        if self.f is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.f = open(self.path, "a", encoding="utf-8")
+        row = {**self.extra, **record, **run.stats, "best_so_far": run.best_fit}
+        self.f.write(json.dumps(row, default=float) + "\n")
+        self.f.flush()
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+
+class GARun:
+    # One GA population advanced a generation at a time; run_ga and the island workers drive it.
+    # init_pop may be a bool array or a PackedPopulation; a packed start (or
+    # cfg.representation == "packed") keeps the whole run in packed form.
+    # resume_from continues a run from a checkpoint written via cfg.checkpoint_path.
+    # init_prob (scalar or per-feature) replaces the 0.5 inclusion probability of a random start.
+    # seed (int or SeedSequence, default cfg.random_state) roots the run's random streams: the initial
+    # population and each generation get their own child stream (see stream), so results depend only
+    # on the seed and the generation, never on evaluator, n_jobs or how the run was split by resumes.
+    def __init__(self, evaluator: PopulationEvaluator, cfg: GAConfig, seed: int = None, init_pop=None,
+                 resume_from: str = None, callbacks=(), init_prob=None):
+        self.evaluator, self.cfg = evaluator, cfg
+        self.callbacks = list(callbacks)
+        self.stats = {}
+        seed = cfg.random_state if seed is None else seed
+        self.seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        n = evaluator.X.shape[1]
+        packed = isinstance(init_pop, PackedPopulation) or (init_pop is None and cfg.representation == "packed")
+        if resume_from is not None:
+            state = load_checkpoint(resume_from, evaluator)
+            self.pop, self.fit, self.best, self.best_fit = state["pop"], state["fit"], state["best"], state["best_fit"]
+            self.history, self.no_improve, self.gen = state["history"], state["no_improve"], state["gen"]
+            self.seed_seq = state["seed_seq"]
+            packed = isinstance(self.pop, PackedPopulation)
+            print(f"Resumed from {resume_from} at gen={self.gen}")
+        else:
+            rng = self.stream(0)
+            if init_pop is not None:
+                pop = init_pop[np.arange(len(init_pop))] if packed else np.array(init_pop, dtype=bool)
+                pop = repair_packed(pop, rng, cfg.min_features) if packed else repair_min_features(pop, rng, cfg.min_features)
+            elif init_prob is not None:
+                pop = repair_min_features(rng.random((cfg.pop_size, n)) < init_prob, rng, cfg.min_features)
+                pop = PackedPopulation.from_bool(pop) if packed else pop
+            elif packed:
+                pop = repair_packed(random_packed(cfg.pop_size, n, rng), rng, cfg.min_features)
+            else:
+                pop = repair_min_features(rng.random((cfg.pop_size, n)) < 0.5, rng, cfg.min_features)
+            self.pop = pop
+            self.fit = evaluator(pop)
+            self.best = pop[np.argmax(self.fit)].copy()
+            self.best_fit = float(self.fit.max())
+            self.history, self.no_improve, self.gen = [], 0, 0
+        self.step_fn = next_generation_packed if packed else next_generation
+        if cfg.selection == "nsga2":
+            if cfg.racing or cfg.surrogate:
+                raise ValueError("selection='nsga2' needs exact fitness for every mask; disable racing and surrogate")
+            self.step_fn = next_generation_nsga
+        self.stopped = False
+        self.last_checkpoint = time.time()
+
+    @property
+    def done(self):
+        return self.stopped or self.gen >= self.cfg.generations
+
+    def stream(self, k: int):
+        # child k of the run's SeedSequence: 0 builds the initial population, g + 1 breeds generation g
+        ss = np.random.SeedSequence(self.seed_seq.entropy, spawn_key=self.seed_seq.spawn_key + (k,))
+        return np.random.Generator(np.random.PCG64(ss))
+
+    def _hook(self, name, *args):
+        stop = False
+        for cb in self.callbacks:
+            fn = getattr(cb, name, None)
+            if fn is not None:
+                stop = bool(fn(self, *args)) or stop
+        return stop
+
+    def step(self):
+        cfg, evaluator, cache = self.cfg, self.evaluator, self.evaluator.cache
+        g = self.gen
+        self._hook("on_generation_start", g)
+        t0 = time.perf_counter()
+        parents, parent_fit, coefs = self.pop, self.fit, evaluator.coefs
+        rng, step_cfg, adapt = self.stream(g + 1), cfg, None
+        if cfg.adaptive:
+            pm, pc, adapt = adapt_operators(self.pop, self.fit, cfg)
+            step_cfg = replace(cfg, pm=pm, pc=pc)
+        self.pop, origin = self.step_fn(self.pop, self.fit, rng, step_cfg)
+        if adapt is not None:
+            adapt["restart"] = self._restart(rng, origin, parent_fit) if adapt["diversity"] < cfg.restart_diversity else 0
+            if adapt["restart"]:
+                print(f"[Restart] diversity {adapt['diversity']:.4f} < {cfg.restart_diversity} at gen={g}: "
+                      f"reseeded {adapt['restart']} masks around the best.")
+        t1 = time.perf_counter()
+        hits, misses = cache.hits, cache.misses
+        self.fit = evaluator(self.pop, origin)
+        if cfg.selection == "nsga2":
+            self._survive(parents, parent_fit, coefs)
+        t2 = time.perf_counter()
+        if self.callbacks:
+            # timings stay out of history so a resumed run reproduces it exactly
+            self.stats = {"gen": g, "op_time": t1 - t0, "eval_time": t2 - t1,
+                          "fits": evaluator.n_evaluated, "cached": evaluator.n_cached,
+                          "store_hits": evaluator.store_hits, "estimated": evaluator.n_estimated,
+                          "infeasible": evaluator.n_infeasible, "duplicates": evaluator.n_duplicate,
+                          "fold_fits": int(evaluator.folds_used.sum()),
+                          "incremental": getattr(evaluator.engine, "n_incremental", None),
+                          "fold_time": evaluator.fold_time.round(6).tolist(),
+                          "peak_rss_mb": peak_rss_mb(), "unique": evaluator.n_unique,
+                          "diversity": population_diversity(self.pop)}
+            self._hook("on_evaluate", g, self.fit)
+        # surrogate estimates never count as the best-so-far
+        exact_fit = np.where(evaluator.estimated, -np.inf, self.fit)
+        gen_best, gen_mean = float(exact_fit.max()), float(self.fit.mean())
+        record = {"gen": g, "best": gen_best, "mean": gen_mean,
+                  "cache_hits": cache.hits - hits, "cache_misses": cache.misses - misses,
+                  "folds_used": int(evaluator.folds_used.sum())}
+        if cfg.store_path:
+            record["store_hits"] = evaluator.store_hits
+        if cfg.surrogate:
+            record.update(estimated=int(evaluator.estimated.sum()), surrogate_corr=evaluator.surrogate_corr)
+        if adapt is not None:
+            record.update(adapt)
+        if cfg.selection == "nsga2":
+            record["front_size"] = int((non_dominated_sort(objectives(self.pop, self.fit, cfg)) == 0).sum())
+        self.history.append(record)
+
+        if gen_best > self.best_fit + 1e-12:
+            self.best_fit = gen_best
+            self.best = self.pop[np.argmax(exact_fit)].copy()
+            self.no_improve = 0
+        else:
+            self.no_improve += 1
+        self.gen = g + 1
+
+        stop = cfg.early_stop and self.no_improve >= cfg.patience
+        if cfg.checkpoint_path and (stop or self.gen == cfg.generations
+                                    or (cfg.checkpoint_every and self.gen % cfg.checkpoint_every == 0)
+                                    or (cfg.checkpoint_seconds and time.time() - self.last_checkpoint >= cfg.checkpoint_seconds)):
+            save_checkpoint(cfg.checkpoint_path, self.gen, self.pop, self.fit, self.best, self.best_fit,
+                            self.no_improve, self.history, self.seed_seq, evaluator)
+            self.last_checkpoint = time.time()
+
+        if stop:
             print(f"[EarlyStop] no improvement for {cfg.patience} generations at gen={g}.")
-            break
+            self.stopped = True
+        if self._hook("on_generation_end", g, record):
+            self.stopped = True
+
+    def _restart(self, rng, origin, parent_fit):
+        # partial restart: the last restart_frac of the children (never the elites) become mutants of
+        # the best mask so far; they inherit warm-start state from the best parent
+        k = min(int(round(self.cfg.restart_frac * len(self.pop))), len(self.pop) - self.cfg.elitism)
+        if k <= 0:
+            return 0
+        rows = np.arange(len(self.pop) - k, len(self.pop))
+        masks = reseed_around(self.best, k, rng, self.cfg.pm_max, self.cfg.min_features)
+        if isinstance(self.pop, PackedPopulation):
+            self.pop.words[rows] = PackedPopulation.from_bool(masks).words
+        else:
+            self.pop[rows] = masks
+        origin[rows] = np.argmax(parent_fit)
+        return k
+
+    def _survive(self, parents, parent_fit, coefs):
+        # NSGA-II (mu + lambda): parents and children compete, the best pop_size by crowded order stay
+        ev = self.evaluator
+        union = concat_populations(parents, self.pop)
+        union_fit = np.r_[parent_fit, self.fit]
+        keep = np.sort(crowded_order(objectives(union, union_fit, self.cfg))[0][:len(self.pop)])
+        self.pop, self.fit = union[keep], union_fit[keep]
+        if ev.coefs is not None and coefs is not None:
+            ev.coefs = np.concatenate([coefs, ev.coefs])[keep]
+
+    def pareto_front(self):
+        return pareto_front(self.pop, self.fit, self.cfg, self.evaluator.fit_times)
+
+    def top(self, k: int):
+        idx = np.argsort(-self.fit, kind="stable")[:k]
+        masks = self.pop[idx].to_bool() if isinstance(self.pop, PackedPopulation) else self.pop[idx]
+        return masks, self.fit[idx]
+
+    def immigrate(self, masks: np.ndarray, fit: np.ndarray):
+        # migrants replace the worst individuals; their fitness came from the same folds, so it is cached as-is
+        worst = np.argsort(self.fit, kind="stable")[:len(masks)]
+        if isinstance(self.pop, PackedPopulation):
+            self.pop.words[worst] = PackedPopulation.from_bool(masks).words
+        else:
+            self.pop[worst] = masks
+        self.fit[worst] = fit
+        for mask, value in zip(masks, fit):
+            self.evaluator.cache.put(mask_key(mask), float(value))
+        if self.evaluator.coefs is not None:
+            self.evaluator.coefs[worst] = 0.0
+        if fit.max() > self.best_fit + 1e-12:
+            self.best_fit = float(fit.max())
+            self.best = masks[np.argmax(fit)].copy()
+
+def run_ga(X_df: pd.DataFrame, y_ser: pd.Series, cfg: GAConfig, init_pop=None, return_population=False,
+           resume_from: str = None, callbacks=(), return_front=False, init_prob=None):
+    # callbacks: objects with any of on_generation_start(run, gen), on_evaluate(run, gen, fit),
+    # on_generation_end(run, gen, record); a truthy on_generation_end return stops the run.
+    t0 = time.time()
+    X_arr = as_float_array(X_df)
+    y_arr = np.asarray(y_ser).astype(int)
+    callbacks = list(callbacks)
+    if cfg.trace_path:
+        callbacks.append(TraceRecorder(cfg.trace_path))
+
+    with evaluation_pool(X_arr, y_arr, cfg) as executor:
+        evaluator = PopulationEvaluator(X_arr, y_arr, cfg, executor)
+        run = GARun(evaluator, cfg, init_pop=init_pop, resume_from=resume_from, callbacks=callbacks,
+                    init_prob=init_prob)
+        try:
+            while not run.done:
+                run.step()
+        finally:
+            for cb in callbacks:
+                if hasattr(cb, "close"):
+                    cb.close()
+        if evaluator.store is not None:
+            evaluator.store.close()
+
+    cache = evaluator.cache
+    print(f"GA finished in {time.time()-t0:.2f}s. Best fitness={run.best_fit:.4f} "
+          f"(cache: {cache.hits} hits / {cache.misses} misses)")
+    out = (run.best, run.best_fit, pd.DataFrame(run.history))
+    if return_population:
+        out += (run.pop, run.fit)
+    if return_front:
+        out += (run.pareto_front(),)
+    return out
+
+# ISLAND MODEL
+class MigrationTransport(ABC):
+    # Carries migrants between islands; send/recv are the only operations the island loop uses,
+    # so a cluster message queue can stand in for the local implementation.
+    @abstractmethod
+    def send(self, src: int, dst: int, payload):
+        ...
+
+    @abstractmethod
+    def recv(self, src: int, dst: int):
+        ...
+
+class QueueTransport(MigrationTransport):
+    # one multiprocessing queue per directed edge of the topology
+    def __init__(self, edges, ctx=None):
+        ctx = ctx or mp.get_context()
+        self.queues = {edge: ctx.Queue() for edge in edges}
+
+    def send(self, src, dst, payload):
+        self.queues[(src, dst)].put(payload)
+
+    def recv(self, src, dst):
+        return self.queues[(src, dst)].get()
+
+def migration_edges(n_islands: int, topology: str):
+    if topology == "ring":
+        return [(i, (i + 1) % n_islands) for i in range(n_islands)] if n_islands > 1 else []
+    if topology == "full":
+        return [(i, j) for i in range(n_islands) for j in range(n_islands) if i != j]
+    raise ValueError("Unknown topology: "+topology)
+
+def island_seeds(cfg: GAConfig):
+    return np.random.SeedSequence(cfg.random_state).spawn(cfg.islands)
+
+def _island_worker(island, x_path, y, cfg, seed, edges, transport, results, init_prob=None):
+    try:
+        X = np.load(x_path, mmap_mode="r")
+        targets = [d for s, d in edges if s == island]
+        sources = sorted(s for s, d in edges if d == island)
+        with evaluation_pool(X, y, cfg) as executor:
+            trace = [TraceRecorder(f"{cfg.trace_path}.island{island}", island=island)] if cfg.trace_path else []
+            run = GARun(PopulationEvaluator(X, y, cfg, executor), cfg, seed=seed, callbacks=trace,
+                        init_prob=init_prob)
+            while not run.done:
+                run.step()
+                if run.gen % cfg.migrate_every == 0 and not run.done:
+                    masks, fit = run.top(cfg.n_migrants)
+                    payload = (PackedPopulation.from_bool(masks).words, fit)
+                    for dst in targets:
+                        transport.send(island, dst, payload)
+                    for src in sources:
+                        words, fit = transport.recv(src, island)
+                        run.immigrate(PackedPopulation(words, X.shape[1]).to_bool(), fit)
+            if run.evaluator.store is not None:
+                run.evaluator.store.close()
+            for cb in trace:
+                cb.close()
+        results.put((island, None, (run.best, run.best_fit, run.history, run.pop, run.fit)))
+    except Exception as e:
+        results.put((island, f"{type(e).__name__}: {e}", None))
+
+def run_islands(X_df, y_ser, cfg: GAConfig, transport: MigrationTransport = None, return_population=False,
+                init_prob=None):
+    # cfg.islands sub-populations evolve in separate processes, each rooted at its own spawned
+    # SeedSequence (the CV folds stay shared), and swap their top cfg.n_migrants every cfg.migrate_every
+    # generations. Migration is synchronous, so per-island early stopping and checkpoints are off.
+    t0 = time.time()
+    X_arr = as_float_array(X_df)
+    y_arr = np.asarray(y_ser).astype(int)
+    icfg = replace(cfg, early_stop=False, checkpoint_path=None)
+    edges = migration_edges(cfg.islands, cfg.topology)
+    ctx = mp.get_context()
+    transport = transport or QueueTransport(edges, ctx)
+    results = ctx.Queue()
+    out = {}
+    with shared_array(X_arr) as x_path:
+        procs = [ctx.Process(target=_island_worker,
+                             args=(i, x_path, y_arr, icfg, seed, edges, transport, results, init_prob))
+                 for i, seed in enumerate(island_seeds(cfg))]
+        for p in procs:
+            p.start()
+        try:
+            dead = set()
+            while len(out) < len(procs):
+                try:
+                    island, error, result = results.get(timeout=1.0)
+                except queue.Empty:
+                    # an island killed outside Python (OOM killer, signal, crash) never posts a result;
+                    # it is reported once it has been gone for a full poll with nothing left to read
+                    gone = {i for i, p in enumerate(procs) if i not in out and p.exitcode is not None}
+                    if gone & dead:
+                        i = min(gone & dead)
+                        raise RuntimeError(f"island {i} exited with code {procs[i].exitcode} without a result")
+                    dead = gone
+                    continue
+                if error is not None:
+                    raise RuntimeError(f"island {island} failed: {error}")
+                out[island] = result
+        finally:
+            for p in procs:
+                if p.is_alive() and len(out) < len(procs):
+                    p.terminate()
+                p.join()
+
+    history = pd.concat([pd.DataFrame(out[i][2]).assign(island=i) for i in sorted(out)], ignore_index=True)
+    winner = max(sorted(out), key=lambda i: out[i][1])
+    best, best_fit = out[winner][0], out[winner][1]
+    print(f"Islands finished in {time.time()-t0:.2f}s. Best fitness={best_fit:.4f} (island {winner})")
+    if return_population:
+        pops = [out[i][3] for i in sorted(out)]
+        if isinstance(pops[0], PackedPopulation):
+            pop = PackedPopulation(np.vstack([p.words for p in pops]), pops[0].n_features)
+        else:
+            pop = np.vstack(pops)
+        return best, best_fit, history, pop, np.concatenate([out[i][4] for i in sorted(out)])
+    return best, best_fit, history
 
-    print(f"GA finished in {time.time()-t0:.2f}s. Best fitness={best_fit:.4f}")
-    return best, best_fit, pd.DataFrame(history)
-
-cfg = GAConfig(
-    pop_size=CONFIG["POP_SIZE"],
-    generations=CONFIG["GENERATIONS"],
-    pc=CONFIG["PC"],
-    pm=CONFIG["PM"],
-    elitism=CONFIG["ELITISM"],
-    penalty_lambda=CONFIG["LAMBDA"],
-    model_name=CONFIG["MODEL_NAME"],
-    scorer=SCORER,
-    cv_splits=CONFIG["CV_SPLITS"],
-    random_state=CONFIG["RANDOM_STATE"],
-    min_features=CONFIG["MIN_FEATURES"],
-    early_stop=CONFIG["EARLY_STOP"],
-    patience=CONFIG["PATIENCE"]
-)
-
-best_mask, best_fit, hist = run_ga(X, y, cfg)
-selected_cols = X.columns[best_mask].tolist()
-print(f"✅ Selected {len(selected_cols)} features out of {X.shape[1]}")
+def run_fingerprint(best, best_fit, history, pop, fit):
+    # sha256 over everything a run decides: best mask and fitness, final population and fitness, history
+    # (store_hits is left out: it depends on what an earlier run left in the fitness store)
+    history = pd.DataFrame(history).drop(columns=["store_hits"], errors="ignore")
+    pop = pop.to_bool() if isinstance(pop, PackedPopulation) else np.asarray(pop, dtype=bool)
+    h = hashlib.sha256()
+    for part in (np.asarray(best, dtype=bool), np.float64(best_fit), pop, np.asarray(fit, dtype=np.float64)):
+        h.update(np.ascontiguousarray(part).tobytes())
+    h.update(json.dumps(history.to_dict("records"), default=float).encode())
+    return h.hexdigest()
+
+def verify_reproducibility(X_df, y_ser, cfg: GAConfig, n_jobs: int = 2):
+    # Runs cfg under every execution layout that must not change the result (serial, thread and process
+    # evaluators with n_jobs workers, and for a single population a run split by a checkpoint resume)
+    # and compares their fingerprints. Early stopping is off so the resume split always lands mid-run.
+    cfg = replace(cfg, early_stop=False, store_path=None, trace_path=None, checkpoint_path=None)
+    layouts = {"serial": replace(cfg, evaluator="serial", n_jobs=1),
+               f"thread x{n_jobs}": replace(cfg, evaluator="thread", n_jobs=n_jobs),
+               f"process x{n_jobs}": replace(cfg, evaluator="process", n_jobs=n_jobs)}
+    rows = []
+    for name, lcfg in layouts.items():
+        if cfg.islands > 1:
+            out = run_islands(X_df, y_ser, lcfg, return_population=True)
+        else:
+            out = run_ga(X_df, y_ser, lcfg, return_population=True)
+        rows.append({"layout": name, "best_fitness": out[1], "fingerprint": run_fingerprint(*out)})
+    if cfg.islands <= 1 and cfg.generations > 1:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "checkpoint.npz")
+            run_ga(X_df, y_ser, replace(cfg, generations=cfg.generations // 2, checkpoint_path=path))
+            out = run_ga(X_df, y_ser, cfg, return_population=True, resume_from=path)
+        rows.append({"layout": f"resumed at gen {cfg.generations // 2}", "best_fitness": out[1],
+                     "fingerprint": run_fingerprint(*out)})
+    report = pd.DataFrame(rows)
+    report["match"] = report["fingerprint"] == report["fingerprint"].iloc[0]
+    return report
+
+# PRE-SCREENING
+def prescreen(X: np.ndarray, y: np.ndarray, cfg: GAConfig) -> pd.DataFrame:
+    # Filter scores for every column from one pass over X in column blocks: ANOVA F, mutual information
+    # with y on prescreen_bins quantile bins, and relevance = mean of the two rank-normalised scores.
+    # The top prescreen_keep columns (a fraction if <= 1, else a count) by relevance are then kept greedily
+    # in relevance order, skipping any whose |correlation| with an already kept column exceeds
+    # prescreen_redundancy. Kept columns get an initial inclusion
+    # probability between 0.2 and 0.8 that grows with relevance.
+    classes, yi = np.unique(y, return_inverse=True)
+    n, d = X.shape
+    K = len(classes)
+    nk = np.bincount(yi, minlength=K).astype(float)
+    Y = np.eye(K)[yi]
+    py = nk / n
+    B = cfg.prescreen_bins
+    q = np.linspace(0, 1, B + 1)[1:-1]
+    f_score, mi, mean, std = np.empty(d), np.empty(d), np.empty(d), np.empty(d)
+    step = max(1, (64 << 20) // max(1, 8 * n))
+    for a in range(0, d, step):
+        blk = np.asarray(X[:, a:a + step], dtype=float)
+        b = blk.shape[1]
+        sums, sq = Y.T @ blk, Y.T @ blk ** 2
+        m = blk.mean(axis=0)
+        between = (nk[:, None] * (sums / nk[:, None] - m) ** 2).sum(axis=0)
+        within = (sq - sums ** 2 / nk[:, None]).sum(axis=0)
+        f_score[a:a + b] = (between / max(K - 1, 1)) / np.maximum(within / max(n - K, 1), 1e-12)
+        mean[a:a + b], std[a:a + b] = m, blk.std(axis=0)
+        edges = np.quantile(blk, q, axis=0)
+        bins = np.zeros(blk.shape, dtype=np.int64)
+        for e in edges:
+            bins += blk > e
+        codes = (np.arange(b) * B + bins) * K + yi[:, None]
+        pxy = np.bincount(codes.ravel(), minlength=b * B * K).reshape(b, B, K) / n
+        px = pxy.sum(axis=2, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mi[a:a + b] = np.nansum(pxy * np.log(pxy / (px * py)), axis=(1, 2))
+
+    def unit_rank(v):
+        return np.argsort(np.argsort(v, kind="stable"), kind="stable") / max(d - 1, 1)
+    relevance = (unit_rank(np.nan_to_num(f_score)) + unit_rank(mi)) / 2
+    n_keep = int(round(cfg.prescreen_keep * d)) if cfg.prescreen_keep <= 1 else int(cfg.prescreen_keep)
+    n_keep = min(d, max(cfg.min_features, n_keep))
+    cand = np.argsort(-relevance, kind="stable")[:n_keep]
+    # correlations among the candidates, accumulated over row chunks
+    sd = np.where(std[cand] > 0, std[cand], 1.0)
+    corr = np.zeros((len(cand), len(cand)))
+    for r in range(0, n, 100_000):
+        Z = (np.asarray(X[r:r + 100_000][:, cand], dtype=float) - mean[cand]) / sd
+        corr += Z.T @ Z
+    corr = np.abs(corr / n)
+    redundancy, keep, kept = np.zeros(d), np.zeros(d, dtype=bool), []
+    for i, c in enumerate(cand):
+        redundancy[c] = corr[i, kept].max(initial=0.0)
+        if redundancy[c] <= cfg.prescreen_redundancy:
+            keep[c] = True
+            kept.append(i)
+    init_prob = np.where(keep, 0.2 + 0.6 * relevance, 0.0)
+    return pd.DataFrame({"f_score": f_score, "mutual_info": mi, "relevance": relevance,
+                         "redundancy": redundancy, "keep": keep, "init_prob": init_prob})
+
+def expand_masks(masks, keep: np.ndarray):
+    # masks over the kept columns -> masks over all original columns
+    masks = masks.to_bool() if isinstance(masks, PackedPopulation) else np.asarray(masks, dtype=bool)
+    full = np.zeros(masks.shape[:-1] + (len(keep),), dtype=bool)
+    full[..., keep] = masks
+    return full
+
+# Maps CONFIG keys to GAConfig fields where the names differ; METRIC becomes the scorer.
+_CONFIG_FIELDS = {"MODEL_NAME": "model_name", "LAMBDA": "penalty_lambda", "RANDOM_STATE": "random_state"}
+
+def config_from_dict(config: dict) -> GAConfig:
+    names = {f.name for f in fields(GAConfig)}
+    kwargs = {"scorer": get_scorer(config.get("METRIC", "accuracy"))}
+    for key, value in config.items():
+        name = _CONFIG_FIELDS.get(key, key.lower())
+        if name in names:
+            kwargs[name] = value
+    return GAConfig(**kwargs)
+
+class GeneticFeatureSelector:
+    # sklearn-style wrapper around run_ga: fit() searches for the best feature mask, transform() applies it
+    def __init__(self, cfg: GAConfig = None, **overrides):
+        self.cfg = replace(cfg or config_from_dict(CONFIG), **overrides)
+
+    def fit(self, X, y, init_pop=None, resume_from: str = None, callbacks=()):
+        self.feature_names_in_ = np.asarray(X.columns if hasattr(X, "columns") else
+                                            [f"x{i}" for i in range(np.shape(X)[1])], dtype=object)
+        init_prob = keep = None
+        cfg, callbacks = self.cfg, list(callbacks)
+        if cfg.islands > 1 and (init_pop is not None or resume_from or callbacks):
+            raise ValueError("islands > 1 does not support init_pop, resume_from or callbacks")
+        self.screen_ = None
+        if cfg.prescreen:
+            # the GA only sees the kept columns; masks are mapped back to all columns below
+            self.screen_ = prescreen(as_float_array(X), np.asarray(y).astype(int), self.cfg)
+            self.screen_.insert(0, "feature", self.feature_names_in_)
+            keep = self.screen_["keep"].to_numpy()
+            init_prob = self.screen_["init_prob"].to_numpy()[keep]
+            X = X.iloc[:, np.flatnonzero(keep)] if hasattr(X, "iloc") else np.asarray(X)[:, keep]
+            if init_pop is not None:
+                init_pop = np.asarray(init_pop, dtype=bool)[:, keep]
+            # the size penalty stays relative to all columns, so fitness matches an unscreened run
+            cfg = replace(cfg, penalty_n=len(keep))
+            print(f"Pre-screening kept {keep.sum()} of {len(keep)} features")
+        if cfg.islands > 1:
+            best, best_fit, hist, pop, fit = run_islands(X, y, cfg, return_population=True, init_prob=init_prob)
+            front = pareto_front(pop, fit, cfg)
+        else:
+            best, best_fit, hist, pop, fit, front = run_ga(X, y, cfg, init_pop=init_pop, return_population=True,
+                                                           resume_from=resume_from, callbacks=callbacks,
+                                                           return_front=True, init_prob=init_prob)
+        if keep is not None:
+            packed = isinstance(pop, PackedPopulation)
+            best, pop = expand_masks(best, keep), expand_masks(pop, keep)
+            pop = PackedPopulation.from_bool(pop) if packed else pop
+            front["mask"] = [expand_masks(m, keep) for m in front["mask"]]
+        self.support_ = np.asarray(best, dtype=bool)
+        self.best_fitness_ = best_fit
+        self.history_ = hist
+        self.population_ = pop
+        self.fitness_ = fit
+        self.pareto_front_ = front
+        return self
+
+    def get_support(self, indices: bool = False):
+        return np.flatnonzero(self.support_) if indices else self.support_
+
+    @property
+    def selected_features_(self):
+        return self.feature_names_in_[self.support_].tolist()
+
+    def transform(self, X):
+        if hasattr(X, "iloc"):
+            return X.iloc[:, self.get_support(indices=True)]
+        return np.asarray(X)[:, self.support_]
+
+    def fit_transform(self, X, y, **kwargs):
+        return self.fit(X, y, **kwargs).transform(X)
 
 # EVALUATION
-def cv_score(model, X, y, scorer, cv_splits=5, seed=42):
-    cv = StratifiedKFold(n_splits=cv_splits, shuffle=True, random_state=seed)
-    return cross_val_score(model, X, y, cv=cv, scoring=scorer).mean()
-
-full_model = make_model(cfg.model_name, cfg.random_state)
-score_full = cv_score(full_model, X.values, y.values, cfg.scorer, cfg.cv_splits, cfg.random_state)
-score_selected = cv_score(full_model, X[selected_cols].values, y.values, cfg.scorer, cfg.cv_splits, cfg.random_state)
-
-before_after = pd.DataFrame({
-    "Setting": ["Full features", "GA-selected"],
-    "Score": [score_full, score_selected],
-    "Metric": [CONFIG["METRIC"], CONFIG["METRIC"]],
-    "NumFeatures": [X.shape[1], len(selected_cols)]
-})
-
-k = max(1, len(selected_cols))
-skb = SelectKBest(score_func=f_classif, k=k)
-rfe = RFE(LogisticRegression(max_iter=500, solver="liblinear", random_state=cfg.random_state), n_features_to_select=k)
-
-pipe_skb = Pipeline([("sel", skb), ("scaler", StandardScaler()),
-                     ("clf", LogisticRegression(max_iter=500, solver="liblinear", random_state=cfg.random_state))])
-pipe_rfe = Pipeline([("rfe", rfe), ("scaler", StandardScaler()),
-                     ("clf", LogisticRegression(max_iter=500, solver="liblinear", random_state=cfg.random_state))])
-
-score_skb = cv_score(pipe_skb, X.values, y.values, cfg.scorer, cfg.cv_splits, cfg.random_state)
-score_rfe = cv_score(pipe_rfe, X.values, y.values, cfg.scorer, cfg.cv_splits, cfg.random_state)
-
-comparison = pd.DataFrame({
-    "Method": ["Full", "GA", f"SelectKBest(k={k})", f"RFE(k={k})"],
-    "CV_Score": [score_full, score_selected, score_skb, score_rfe],
-    "Metric": [CONFIG["METRIC"]]*4,
-    "NumFeatures": [X.shape[1], len(selected_cols), k, k]
-}).sort_values("CV_Score", ascending=False).reset_index(drop=True)
-
-mask_df = pd.DataFrame({"feature": X.columns, "selected": [bool(m) for m in best_mask]})
+def _method_fold_score(model, X, y, cols, train, test, scorer):
+    from sklearn.base import clone
+    from sklearn.metrics import get_scorer as sk_get_scorer
+    Xs = X if cols is None else X[:, cols]
+    model = clone(model).fit(Xs[train], y[train])
+    return (sk_get_scorer(scorer) if isinstance(scorer, str) else scorer)(model, Xs[test], y[test])
+
+def compare_methods(X: np.ndarray, y: np.ndarray, methods: dict, cfg: GAConfig, n_jobs: int = None):
+    # methods: name -> (estimator, column indices or None for all). Every (method, fold) fit runs as
+    # its own joblib task on the GA's fold splits; returns name -> mean CV score. Tasks run in threads:
+    # liblinear releases the GIL, and its primal L2 logistic solver draws no random numbers, so the
+    # scores do not depend on scheduling (the thread evaluator relies on the same property).
+    from joblib import Parallel, delayed
+    folds = fold_splits(y, cfg)
+    tasks = [(name, model, cols, tr, te) for name, (model, cols) in methods.items() for tr, te in folds]
+    scores = Parallel(n_jobs=cfg.n_jobs if n_jobs is None else n_jobs, prefer="threads")(
+        delayed(_method_fold_score)(model, X, y, cols, tr, te, cfg.scorer) for _, model, cols, tr, te in tasks)
+    out = {name: [] for name in methods}
+    for (name, *_), score in zip(tasks, scores):
+        out[name].append(score)
+    return {name: float(np.mean(v)) for name, v in out.items()}
+
+def evaluate_baselines(X: pd.DataFrame, y: pd.Series, selected_cols: list, cfg: GAConfig, metric: str,
+                       rfe_step=1, n_jobs: int = None):
+    from sklearn.feature_selection import RFE, SelectKBest, f_classif
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.linear_model import LogisticRegression
+
+    full_model = make_model(cfg.model_name, cfg.random_state, cfg.ridge_alpha)
+
+    k = max(1, len(selected_cols))
+    skb = SelectKBest(score_func=f_classif, k=k)
+    rfe = RFE(LogisticRegression(max_iter=500, solver="liblinear", random_state=cfg.random_state), n_features_to_select=k,
+              step=rfe_step)
+
+    pipe_skb = Pipeline([("sel", skb), ("scaler", StandardScaler()),
+                         ("clf", LogisticRegression(max_iter=500, solver="liblinear", random_state=cfg.random_state))])
+    pipe_rfe = Pipeline([("rfe", rfe), ("scaler", StandardScaler()),
+                         ("clf", LogisticRegression(max_iter=500, solver="liblinear", random_state=cfg.random_state))])
+
+    scores = compare_methods(np.asarray(X), np.asarray(y), {
+        "full": (full_model, None), "selected": (full_model, X.columns.get_indexer(selected_cols)),
+        "skb": (pipe_skb, None), "rfe": (pipe_rfe, None)}, cfg, n_jobs)
+    score_full, score_selected, score_skb, score_rfe = scores["full"], scores["selected"], scores["skb"], scores["rfe"]
+
+    before_after = pd.DataFrame({
+        "Setting": ["Full features", "GA-selected"],
+        "Score": [score_full, score_selected],
+        "Metric": [metric, metric],
+        "NumFeatures": [X.shape[1], len(selected_cols)]
+    })
+
+    comparison = pd.DataFrame({
+        "Method": ["Full", "GA", f"SelectKBest(k={k})", f"RFE(k={k})"],
+        "CV_Score": [score_full, score_selected, score_skb, score_rfe],
+        "Metric": [metric]*4,
+        "NumFeatures": [X.shape[1], len(selected_cols), k, k]
+    }).sort_values("CV_Score", ascending=False).reset_index(drop=True)
+    return before_after, comparison
 
 # SAVE OUTPUTS
-os.makedirs("outputs", exist_ok=True)
-before_after.to_csv("outputs/before_after.csv", index=False)
-comparison.to_csv("outputs/comparison.csv", index=False)
-mask_df.to_csv("outputs/feature_mask.csv", index=False)
-with open("outputs/selected_features.json", "w", encoding="utf-8") as f:
-    json.dump(selected_cols, f, ensure_ascii=False, indent=2)
-
-plt.figure(figsize=(6,4))
-plt.plot(hist["gen"], hist["best"], label="Best")
-plt.plot(hist["gen"], hist["mean"], label="Mean")
-plt.xlabel("Generation"); plt.ylabel("Fitness"); plt.title("GA Evolution")
-plt.legend(); plt.tight_layout()
-plt.savefig("outputs/ga_evolution.png", dpi=160); plt.close()
-
-plt.figure(figsize=(6,4))
-plt.bar(comparison["Method"], comparison["CV_Score"])
-plt.title(f"Score comparison ({CONFIG['METRIC']})"); plt.ylabel(f"CV {CONFIG['METRIC']}")
-plt.tight_layout()
-plt.savefig("outputs/score_comparison.png", dpi=160); plt.close()
-
-plt.figure(figsize=(6,4))
-plt.bar(comparison["Method"], comparison["NumFeatures"])
-plt.title("Number of features"); plt.ylabel("#Features")
-plt.tight_layout()
-plt.savefig("outputs/features_count.png", dpi=160); plt.close()
-
-print("✅ All outputs saved successfully in 'outputs/' folder.")
-print("Done.")
+def save_outputs(out_dir: str, before_after, comparison, mask_df, selected_cols):
+    os.makedirs(out_dir, exist_ok=True)
+    before_after.to_csv(os.path.join(out_dir, "before_after.csv"), index=False)
+    comparison.to_csv(os.path.join(out_dir, "comparison.csv"), index=False)
+    mask_df.to_csv(os.path.join(out_dir, "feature_mask.csv"), index=False)
+    with open(os.path.join(out_dir, "selected_features.json"), "w", encoding="utf-8") as f:
+        json.dump(selected_cols, f, ensure_ascii=False, indent=2)
+
+def save_front(out_dir: str, front: pd.DataFrame, feature_names):
+    out = front.drop(columns="mask")
+    out.insert(0, "features", [";".join(np.asarray(feature_names)[m]) for m in front["mask"]])
+    out.to_csv(os.path.join(out_dir, "pareto_front.csv"), index=False)
+
+def save_plots(out_dir: str, hist: pd.DataFrame, comparison: pd.DataFrame, metric: str):
+    # matplotlib is only imported when plots are actually requested
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(6,4))
+    plt.plot(hist["gen"], hist["best"], label="Best")
+    plt.plot(hist["gen"], hist["mean"], label="Mean")
+    plt.xlabel("Generation"); plt.ylabel("Fitness"); plt.title("GA Evolution")
+    plt.legend(); plt.tight_layout()
+    plt.savefig(os.path.join(out_dir, "ga_evolution.png"), dpi=160); plt.close()
+
+    plt.figure(figsize=(6,4))
+    plt.bar(comparison["Method"], comparison["CV_Score"])
+    plt.title(f"Score comparison ({metric})"); plt.ylabel(f"CV {metric}")
+    plt.tight_layout()
+    plt.savefig(os.path.join(out_dir, "score_comparison.png"), dpi=160); plt.close()
+
+    plt.figure(figsize=(6,4))
+    plt.bar(comparison["Method"], comparison["NumFeatures"])
+    plt.title("Number of features"); plt.ylabel("#Features")
+    plt.tight_layout()
+    plt.savefig(os.path.join(out_dir, "features_count.png"), dpi=160); plt.close()
+
+# RUN ARTIFACT
+# One compressed .npz per run, written once at the end. Tables are stored column by column as
+# "<table>/<column>" members (a column of masks as one 2-D bool member) and the population as packed
+# words. np.load only reads the zip directory, so RunArtifact decompresses just the members it is asked for.
+ARTIFACT_VERSION = 1
+
+def _column_array(values):
+    arr = np.asarray(values)
+    if arr.dtype != object:
+        return arr
+    if len(arr) and isinstance(arr[0], np.ndarray):
+        return np.stack(arr)
+    if all(v is None or (isinstance(v, (int, float, np.number)) and not isinstance(v, bool)) for v in arr):
+        return arr.astype(float)  # None -> NaN
+    return arr.astype(str)
+
+def save_run_artifact(runs_dir: str, config: dict, feature_names, best, best_fit, history, pop, fit,
+                      tables: dict = None, dataset: str = None, timings: dict = None):
+    # writes runs_dir/<time>-<run hash>.npz and returns its path;
+    # tables: name -> DataFrame (before_after, comparison, front, prescreen, ...)
+    pop = pop if isinstance(pop, PackedPopulation) else PackedPopulation.from_bool(pop)
+    best = np.asarray(best, dtype=bool)
+    run = run_fingerprint(best, best_fit, history, pop, fit)
+    created = time.strftime("%Y-%m-%dT%H:%M:%S")
+    arrays = {
+        "version": ARTIFACT_VERSION, "created": created,
+        "config": json.dumps(config, default=str), "dataset": dataset or "", "run": run,
+        "feature_names": np.asarray(feature_names, dtype=str), "best_mask": best,
+        "best_fitness": float(best_fit), "population/words": pop.words, "population/fitness": np.asarray(fit, float),
+    }
+    for name, df in {"history": pd.DataFrame(history), "timings": pd.DataFrame([timings or {}]),
+                     **(tables or {})}.items():
+        for col in df.columns:
+            arrays[f"{name}/{col}"] = _column_array(df[col].to_numpy())
+    os.makedirs(runs_dir, exist_ok=True)
+    path = os.path.join(runs_dir, f"{created.replace(':', '').replace('-', '')}-{run[:12]}.npz")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp, path)
+    return path
+
+class RunArtifact:
+    # Lazy read access to a file written by save_run_artifact
+    def __init__(self, path: str):
+        self.path = path
+        self.npz = np.load(path, allow_pickle=False)
+        version = int(self.npz["version"])
+        if version != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported run artifact version {version} in {path}")
+
+    def __getitem__(self, key: str):
+        return self.npz[key]
+
+    def __contains__(self, key: str):
+        return key in self.npz.files
+
+    def columns(self, table: str):
+        prefix = table + "/"
+        return [k[len(prefix):] for k in self.npz.files if k.startswith(prefix)]
+
+    def table(self, table: str, columns=None) -> pd.DataFrame:
+        data = {}
+        for col in columns or self.columns(table):
+            arr = self.npz[f"{table}/{col}"]
+            data[col] = list(arr) if arr.ndim > 1 else arr
+        return pd.DataFrame(data)
+
+    @property
+    def config(self) -> dict:
+        return json.loads(str(self.npz["config"]))
+
+    @property
+    def feature_names(self):
+        return self.npz["feature_names"].tolist()
+
+    @property
+    def best_mask(self):
+        return self.npz["best_mask"]
+
+    @property
+    def selected_features(self):
+        return np.asarray(self.feature_names)[self.best_mask].tolist()
+
+    @property
+    def population(self):
+        return PackedPopulation(self.npz["population/words"], len(self.best_mask))
+
+    @property
+    def fitness(self):
+        return self.npz["population/fitness"]
+
+    @property
+    def history(self):
+        return self.table("history")
+
+    def close(self):
+        self.npz.close()
+
+def list_runs(runs_dir: str) -> pd.DataFrame:
+    # one summary row per artifact in runs_dir, newest first; reads only the small members
+    rows = []
+    for name in sorted(os.listdir(runs_dir)) if os.path.isdir(runs_dir) else []:
+        if not name.endswith(".npz"):
+            continue
+        path = os.path.join(runs_dir, name)
+        try:
+            art = RunArtifact(path)
+        except (ValueError, OSError, KeyError):
+            continue
+        config = art.config
+        rows.append({"path": path, "created": str(art["created"]), "data": config.get("DATA_PATH"),
+                     "model": config.get("MODEL_NAME"), "metric": config.get("METRIC"),
+                     "best_fitness": float(art["best_fitness"]), "n_selected": int(art.best_mask.sum()),
+                     "n_features": len(art.best_mask), "dataset": str(art["dataset"])})
+        art.close()
+    df = pd.DataFrame(rows, columns=["path", "created", "data", "model", "metric", "best_fitness",
+                                     "n_selected", "n_features", "dataset"])
+    return df.sort_values(["created", "path"], ascending=False).reset_index(drop=True)
+
+def export_run(path: str, out_dir: str, plots: bool = True):
+    # writes the classic outputs/ files (CSV, JSON and optionally PNG plots) from a run artifact
+    art = RunArtifact(path)
+    comparison = art.table("comparison")
+    mask_df = pd.DataFrame({"feature": art.feature_names, "selected": art.best_mask.tolist()})
+    save_outputs(out_dir, art.table("before_after"), comparison, mask_df, art.selected_features)
+    if "front/mask" in art:
+        save_front(out_dir, art.table("front"), art.feature_names)
+    if art.columns("prescreen"):
+        art.table("prescreen").to_csv(os.path.join(out_dir, "prescreen.csv"), index=False)
+    if plots:
+        save_plots(out_dir, art.history, comparison, art.config["METRIC"])
+    art.close()
+
+def run_pipeline(config: dict = None, out_dir: str = "outputs", plots: bool = True, callbacks=(),
+                 export: bool = False):
+    # Runs the GA and the baselines and writes one run artifact to out_dir/runs (see save_run_artifact).
+    # export=True also writes the classic CSV/JSON files (and PNG plots when plots is set) to out_dir.
+    config = {**CONFIG, **(config or {})}
+    t0 = time.time()
+    X, y, target_col = load_data(config["DATA_PATH"], config["DATA_CACHE"], config["DATA_DTYPE"])
+    print(f"✅ Data loaded: X={X.shape}, y={y.shape}, target='{target_col}'")
+    t_load = time.time()
+
+    selector = GeneticFeatureSelector(config_from_dict(config))
+    selector.fit(X, y, resume_from=config["RESUME_FROM"], callbacks=callbacks)
+    selected_cols = selector.selected_features_
+    print(f"✅ Selected {len(selected_cols)} features out of {X.shape[1]}")
+    t_ga = time.time()
+
+    before_after, comparison = evaluate_baselines(X, y, selected_cols, selector.cfg, config["METRIC"],
+                                                  rfe_step=config["RFE_STEP"])
+    t_base = time.time()
+    tables = {"before_after": before_after, "comparison": comparison}
+    if selector.cfg.selection == "nsga2":
+        tables["front"] = selector.pareto_front_
+    if selector.screen_ is not None:
+        tables["prescreen"] = selector.screen_
+    fingerprint = dataset_fingerprint(as_float_array(X), np.asarray(y).astype(int))
+    timings = {"load": t_load - t0, "ga": t_ga - t_load, "baselines": t_base - t_ga, "total": time.time() - t0}
+    path = save_run_artifact(os.path.join(out_dir, "runs"), config, X.columns, selector.support_, selector.best_fitness_, selector.history_,
+                      selector.population_, selector.fitness_, tables, fingerprint, timings)
+    if export:
+        export_run(path, out_dir, plots)
+    print(f"✅ Run saved to '{path}'.")
+    return selector, before_after, comparison
+
+def _parse_value(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+def parse_args(argv=None):
+    # every CONFIG key is also a flag, e.g. POP_SIZE -> --pop-size 50; values are parsed as JSON
+    parser = argparse.ArgumentParser(prog="python -m ga_core", description="GA feature selection")
+    parser.add_argument("--config", help="JSON file with CONFIG overrides")
+    parser.add_argument("--out", default="outputs", help="output directory")
+    parser.add_argument("--export", action="store_true",
+                        help="also write the CSV/JSON/PNG files next to the run artifact")
+    parser.add_argument("--no-plots", action="store_true", help="skip the PNG plots when exporting")
+    parser.add_argument("--verify-repro", action="store_true",
+                        help="only check that the configured run is bit-identical across evaluators, n_jobs and resumes")
+    for key in CONFIG:
+        parser.add_argument("--" + key.lower().replace("_", "-"), dest=key, type=_parse_value,
+                            default=argparse.SUPPRESS, metavar="VALUE")
+    args = vars(parser.parse_args(argv))
+    config = {}
+    path = args.pop("config")
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            config.update(json.load(f))
+    out_dir, no_plots, verify = args.pop("out"), args.pop("no_plots"), args.pop("verify_repro")
+    export = args.pop("export")
+    config.update(args)
+    return config, out_dir, not no_plots, verify, export
+
+def main(argv=None):
+    warnings.filterwarnings("ignore")
+    config, out_dir, plots, verify, export = parse_args(argv)
+    if verify:
+        config = {**CONFIG, **config}
+        X, y, _ = load_data(config["DATA_PATH"], config["DATA_CACHE"], config["DATA_DTYPE"])
+        report = verify_reproducibility(X, y, config_from_dict(config), max(2, config["N_JOBS"]))
+        print(report.to_string(index=False))
+        if not report["match"].all():
+            print("❌ Runs differ between execution layouts.")
+            sys.exit(1)
+        print("✅ All execution layouts are bit-identical.")
+        return
+    run_pipeline(config, out_dir, plots, export=export)
+    print("Done.")
+
+if __name__ == "__main__":
+    main()
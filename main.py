@@ -1,11 +1,110 @@
 import streamlit as st
 import pandas as pd
 import os
-import json
-import subprocess
-import sys
+import html
+import threading
+import time
+import traceback
+
+import ga_core
 
 OUTPUT_DIR = "outputs"
+RUNS_DIR = os.path.join(OUTPUT_DIR, "runs")
+
+# Each GA run is one artifact file that never changes after it is written, so the tables read from
+# it are cached by path and only the columns a page shows are read. The run list is keyed on the
+# mtime of the runs folder, so a finished run shows up without a restart.
+def file_mtime(path):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+@st.cache_data(show_spinner=False)
+def load_runs(mtime):
+    return ga_core.list_runs(RUNS_DIR)
+
+@st.cache_data(show_spinner=False)
+def load_table(path, table, columns=None):
+    art = ga_core.RunArtifact(path)
+    try:
+        return art.table(table, columns)
+    finally:
+        art.close()
+
+@st.cache_data(show_spinner=False)
+def load_selected(path):
+    art = ga_core.RunArtifact(path)
+    try:
+        return art.selected_features
+    finally:
+        art.close()
+
+class JobCancelled(Exception):
+    pass
+
+class GAJob:
+    # Runs ga_core.run_pipeline in a background thread. It is also the GA callback: every generation
+    # record is appended to history for the page to poll, and a set cancel flag aborts the run.
+    def __init__(self, config=None):
+        self.config = {**ga_core.CONFIG, **(config or {})}
+        self.history = []
+        self.status, self.error, self.ga_done = "running", None, False
+        self.cancel_event = threading.Event()
+        self.started = time.time()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def on_generation_start(self, run, gen):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def on_generation_end(self, run, gen, record):
+        self.history.append({**record, "best_so_far": run.best_fit})
+        self.ga_done = run.done
+
+    def _run(self):
+        try:
+            ga_core.run_pipeline(self.config, OUTPUT_DIR, callbacks=[self])
+            self.status = "done"
+        except JobCancelled:
+            self.status = "cancelled"
+        except Exception:
+            self.status, self.error = "failed", traceback.format_exc()
+
+    @property
+    def running(self):
+        return self.status == "running"
+
+@st.fragment(run_every=1.0)
+def job_progress():
+    # reruns on its own every second, so only this block refreshes while the GA works
+    job = st.session_state.get("ga_job")
+    if job is None:
+        return
+    total = job.config["GENERATIONS"]
+    done = len(job.history)
+    elapsed = time.time() - job.started
+    if job.running:
+        text = "⏳ حساب المقارنات وحفظ النتائج..." if job.ga_done else f"🔄 الجيل {done} من {total} ({elapsed:.0f} ث)"
+        st.progress(1.0 if job.ga_done else min(done / total, 1.0), text=text)
+        if st.button("⏹️ إلغاء التشغيل", key="cancel_ga"):
+            job.cancel_event.set()
+    elif job.status == "done":
+        st.success("""
+        ✅ **تم التنفيذ بنجاح!**
+        
+        تم حفظ نتائج التشغيل في مجلد 'outputs/runs/'
+        """)
+    elif job.status == "cancelled":
+        st.warning(f"⏹️ تم إلغاء التشغيل بعد {done} جيل")
+    else:
+        st.error("❌ حدث خطأ أثناء التنفيذ")
+        with st.expander("📋 تفاصيل الخطأ"):
+            st.code(job.error)
+    if job.history:
+        hist = pd.DataFrame(job.history)
+        col1, col2 = st.columns(2)
+        col1.metric("🎯 أفضل Fitness", f"{hist['best_so_far'].iloc[-1]:.4f}")
+        col2.metric("🧬 الأجيال المكتملة", f"{done} / {total}")
+        st.line_chart(hist.set_index("gen")[["best", "mean"]])
 
 st.set_page_config(
     page_title="BIA601 - Genetic Algorithm Feature Selection",
@@ -241,6 +340,22 @@ h3 {
     color: #E67E22;
 }
 
+.feature-grid {
+    display: grid;
+    grid-template-columns: repeat(3, 1fr);
+    gap: 10px;
+}
+
+.feature-card {
+    background: linear-gradient(45deg, #3498DB, #2980B9);
+    color: white;
+    padding: 15px;
+    border-radius: 10px;
+    margin: 5px 0;
+    text-align: center;
+    font-weight: bold;
+}
+
 </style>
 """, unsafe_allow_html=True)
 
@@ -267,6 +382,15 @@ with st.sidebar:
     )
     
     st.markdown("---")
+
+    runs = load_runs(file_mtime(RUNS_DIR))
+    run_path = None
+    if len(runs):
+        labels = dict(zip(runs["path"], runs["created"].str.replace("T", " ") + " — "
+                          + runs["best_fitness"].map("{:.4f}".format)))
+        run_path = st.selectbox("🗂️ اختر التشغيل:", list(labels), format_func=labels.get)
+
+    st.markdown("---")
     
     st.markdown("""
     <div style='background:rgba(255,255,255,0.1); padding:15px; border-radius:10px;'>
@@ -341,32 +465,16 @@ elif section == "⚡ تشغيل الخوارزمية":
     col1, col2, col3 = st.columns([1, 2, 1])
     
     with col2:
-        if st.button("🎯 تشغيل الخوارزمية الجينية", key="run_ga"):
-            with st.spinner("🔄 جاري تنفيذ الخوارزمية... قد يستغرق هذا بضع دقائق"):
-                try:
-                    result = subprocess.run(
-                        [sys.executable, "ga_core.py"],
-                        capture_output=True, text=True
-                    )
-                    if result.returncode == 0:
-                        st.success("""
-                        ✅ **تم التنفيذ بنجاح!**
-                        
-                        تم إنشاء جميع الملفات والنتائج في مجلد 'outputs/'
-                        """)
-                    else:
-                        st.error("❌ حدث خطأ أثناء التنفيذ")
-                        with st.expander("📋 تفاصيل الخطأ"):
-                            st.code(result.stderr)
-                except Exception as e:
-                    st.error(f"❌ خطأ غير متوقع: {e}")
+        job = st.session_state.get("ga_job")
+        if st.button("🎯 تشغيل الخوارزمية الجينية", key="run_ga", disabled=job is not None and job.running):
+            st.session_state["ga_job"] = GAJob()
+        job_progress()
 
 elif section == "📊 النتائج قبل وبعد":
     st.header("📊 النتائج قبل وبعد تطبيق الخوارزمية الجينية")
     
-    path = os.path.join(OUTPUT_DIR, "before_after.csv")
-    if os.path.exists(path):
-        df = pd.read_csv(path)
+    if run_path is not None:
+        df = load_table(run_path, "before_after")
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -376,7 +484,7 @@ elif section == "📊 النتائج قبل وبعد":
         
         with col2:
             st.metric("🔽 انخفاض الميزات", 
-                     f"{df.iloc[0,2] - df.iloc[1,2]} ميزة")
+                     f"{df['NumFeatures'].iloc[0] - df['NumFeatures'].iloc[1]} ميزة")
         
         with col3:
             st.metric("🎯 أفضل دقة", f"{df.iloc[1,1]:.4f}")
@@ -398,9 +506,8 @@ elif section == "📊 النتائج قبل وبعد":
 elif section == "⚖️ مقارنة الطرق":
     st.header("⚖️ مقارنة أداء الطرق المختلفة")
     
-    path = os.path.join(OUTPUT_DIR, "comparison.csv")
-    if os.path.exists(path):
-        df = pd.read_csv(path)
+    if run_path is not None:
+        df = load_table(run_path, "comparison")
         
         best_method = df.loc[df['CV_Score'].idxmax()]
         
@@ -432,14 +539,12 @@ elif section == "📈 الرسوم البيانية":
     st.header("📈 التصورات البيانية للنتائج")
     
     plots_info = {
-        "ga_evolution.png": "📊 تطور Fitness عبر الأجيال",
-        "score_comparison.png": "⚖️ مقارنة الدرجات بين الطرق", 
-        "features_count.png": "📊 عدد الميزات في كل طريقة"
+        "evolution": "📊 تطور Fitness عبر الأجيال",
+        "scores": "⚖️ مقارنة الدرجات بين الطرق",
+        "features": "📊 عدد الميزات في كل طريقة"
     }
     
-    available_plots = [plot for plot in plots_info.keys() if os.path.exists(os.path.join(OUTPUT_DIR, plot))]
-    
-    if available_plots:
+    if run_path is not None:
         selected_plots = st.multiselect(
             "🎨 اختر الرسوم البيانية:",
             list(plots_info.keys()),
@@ -448,19 +553,21 @@ elif section == "📈 الرسوم البيانية":
         )
         
         if selected_plots:
+            # drawn from the run's columns when shown, nothing is rasterized ahead of time
             cols_per_row = 2
             for i in range(0, len(selected_plots), cols_per_row):
                 cols = st.columns(cols_per_row)
-                for col, img_file in zip(cols, selected_plots[i:i+cols_per_row]):
-                    img_path = os.path.join(OUTPUT_DIR, img_file)
-                    caption = plots_info[img_file]
+                for col, plot in zip(cols, selected_plots[i:i+cols_per_row]):
                     with col:
-                        if os.path.exists(img_path):
-                            st.image(img_path, 
-                                   caption=caption, 
-                                   use_container_width=True)
+                        st.caption(plots_info[plot])
+                        if plot == "evolution":
+                            hist = load_table(run_path, "history", ("gen", "best", "mean"))
+                            # island runs have one row per island and generation
+                            st.line_chart(hist.groupby("gen").agg(best=("best", "max"), mean=("mean", "mean")))
                         else:
-                            st.warning(f"⚠️ {img_file} غير موجود")
+                            column = "CV_Score" if plot == "scores" else "NumFeatures"
+                            df = load_table(run_path, "comparison", ("Method", column))
+                            st.bar_chart(df.set_index("Method")[column])
     else:
         st.warning("""
         ⚠️ لا توجد رسوم بيانية متاحة
@@ -470,10 +577,8 @@ elif section == "📈 الرسوم البيانية":
 elif section == "✨ الميزات المختارة":
     st.header("✨ الميزات المختارة بالخوارزمية الجينية")
     
-    path = os.path.join(OUTPUT_DIR, "selected_features.json")
-    if os.path.exists(path):
-        with open(path, "r", encoding="utf-8") as f:
-            features = json.load(f)
+    if run_path is not None:
+        features = load_selected(run_path)
         
         st.markdown(f"""
         <div class='card'>
@@ -483,22 +588,9 @@ elif section == "✨ الميزات المختارة":
         """, unsafe_allow_html=True)
         
         with st.expander("📋 عرض قائمة الميزات المختارة", expanded=True):
-            cols = st.columns(3)
-            for idx, feature in enumerate(features):
-                with cols[idx % 3]:
-                    st.markdown(f"""
-                    <div style='
-                        background: linear-gradient(45deg, #3498DB, #2980B9);
-                        color: white;
-                        padding: 15px;
-                        border-radius: 10px;
-                        margin: 5px 0;
-                        text-align: center;
-                        font-weight: bold;
-                    '>
-                        {feature}
-                    </div>
-                    """, unsafe_allow_html=True)
+            # one HTML block for all cards instead of one st.markdown per feature
+            cards = "".join(f"<div class='feature-card'>{html.escape(str(feature))}</div>" for feature in features)
+            st.markdown(f"<div class='feature-grid'>{cards}</div>", unsafe_allow_html=True)
     else:
         st.warning("""
         ⚠️ ملف الميزات غير موجود
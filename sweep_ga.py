@@ -0,0 +1,163 @@
+import os, sys, json, time, argparse, itertools, traceback, warnings
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+import ga_core
+
+# Runs a grid of GA configurations in one pool of long-lived worker processes and writes one results table.
+#   python sweep_ga.py --datasets a.csv b.csv --models logreg dt --pop-sizes 30 100 --seeds 1 2 3 --cores 8
+#   python sweep_ga.py --grid nightly.json --out sweep/results.parquet
+# A grid file is {"base": {CONFIG overrides}, "grid": {CONFIG key: [values, ...]}}. Every combination is
+# one run; a run occupies N_JOBS cores of the --cores budget. CSVs are converted once to memory-mapped
+# .npy files (DATA_CACHE, default <out dir>/data_cache) that all workers map, and each worker keeps
+# its loaded datasets and fold plans for later runs on the same data.
+
+GRID_FLAGS = {"datasets": "DATA_PATH", "models": "MODEL_NAME", "metrics": "METRIC", "pop_sizes": "POP_SIZE",
+              "pm": "PM", "lambdas": "LAMBDA", "seeds": "RANDOM_STATE"}
+
+_DATA, _PLANS = {}, {}  # per worker process
+
+def expand_grid(base: dict, grid: dict):
+    keys = list(grid)
+    return [{**base, **dict(zip(keys, values))} for values in itertools.product(*(grid[k] for k in keys))]
+
+def _dataset(config: dict):
+    key = (config["DATA_PATH"], config["DATA_CACHE"], config["DATA_DTYPE"])
+    if key not in _DATA:
+        X, y, _ = ga_core.load_data(*key)
+        _DATA[key] = (X.columns.tolist(), ga_core.as_float_array(X), np.asarray(y).astype(int))
+    return _DATA[key]
+
+def _fold_plan(config: dict, cfg, X, y):
+    key = (config["DATA_PATH"], cfg.model_name, str(cfg.scorer), cfg.cv_splits, cfg.random_state, cfg.dt_bins)
+    if key not in _PLANS:
+        _PLANS[key] = ga_core.FoldPlan(X, y, cfg)
+    return _PLANS[key]
+
+def run_one(run_id: int, config: dict):
+    # one single-population GA run on the full feature set; returns a results row
+    warnings.filterwarnings("ignore")
+    row = {"run_id": run_id, "dataset": config["DATA_PATH"], "model_name": config["MODEL_NAME"],
+           "metric": config["METRIC"], "pop_size": config["POP_SIZE"], "pm": config["PM"],
+           "lambda": config["LAMBDA"], "seed": config["RANDOM_STATE"]}
+    t0 = time.time()
+    callbacks = []
+    try:
+        # settings run_one cannot honour fail the run instead of being silently ignored
+        unsupported = [k for k in ("PRESCREEN", "RESUME_FROM") if config.get(k)]
+        if int(config.get("ISLANDS", 1)) > 1:
+            unsupported.append("ISLANDS")
+        if unsupported:
+            raise ValueError(f"sweep runs do not support {', '.join(unsupported)}")
+        columns, X, y = _dataset(config)
+        cfg = ga_core.config_from_dict(config)
+        for name in ("checkpoint_path", "trace_path"):
+            if getattr(cfg, name):
+                cfg = replace(cfg, **{name: f"{getattr(cfg, name)}.run{run_id}"})
+        if cfg.trace_path:
+            callbacks.append(ga_core.TraceRecorder(cfg.trace_path, run_id=run_id))
+        with ga_core.evaluation_pool(X, y, cfg) as executor:
+            evaluator = ga_core.PopulationEvaluator(X, y, cfg, executor, plan=_fold_plan(config, cfg, X, y))
+            run = ga_core.GARun(evaluator, cfg, callbacks=callbacks)
+            while not run.done:
+                run.step()
+            if evaluator.store is not None:
+                evaluator.store.close()
+        best = np.asarray(run.best, dtype=bool)
+        row.update(status="ok", best_fitness=run.best_fit,
+                   cv_score=run.best_fit + cfg.penalty_lambda * best.sum() / len(best),
+                   n_selected=int(best.sum()), generations=run.gen,
+                   evaluations=evaluator.cache.misses, selected=";".join(np.asarray(columns)[best]))
+    except Exception as e:
+        row.update(status="failed", error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc())
+    finally:
+        for cb in callbacks:
+            cb.close()
+    row["wall_time"] = time.time() - t0
+    row["worker"] = os.getpid()
+    return row
+
+def write_results(rows, path: str):
+    df = pd.DataFrame(rows).sort_values("run_id").reset_index(drop=True)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return df
+
+def run_sweep(configs, cores: int, out: str):
+    # Greedy core-budget scheduler: runs are started in grid order (grouped by dataset) whenever
+    # their N_JOBS fit in the cores left; a run wider than the budget runs alone.
+    if not configs:
+        return pd.DataFrame()
+    for path, cache_dir, dtype in sorted({(c["DATA_PATH"], c["DATA_CACHE"], c["DATA_DTYPE"]) for c in configs}):
+        if cache_dir and os.path.exists(path):  # a missing file fails its runs in the workers
+            ga_core.convert_csv(path, cache_dir, dtype)  # once, before any worker maps it
+    order = sorted(range(len(configs)), key=lambda i: configs[i]["DATA_PATH"])
+    pending = [(i, configs[i]) for i in order]
+    rows, running, used = [], {}, 0
+    t0 = time.time()
+    with ProcessPoolExecutor(max_workers=cores) as pool:
+        while pending or running:
+            while pending:
+                need = min(max(1, int(pending[0][1]["N_JOBS"])), cores)
+                if running and used + need > cores:
+                    break
+                i, config = pending.pop(0)
+                running[pool.submit(run_one, i, config)] = need
+                used += need
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                used -= running.pop(fut)
+                row = fut.result()
+                rows.append(row)
+                print(f"[{len(rows)}/{len(configs)}] run {row['run_id']} {row['status']} "
+                      f"fitness={row.get('best_fitness', float('nan')):.4f} ({row['wall_time']:.1f}s)")
+                write_results(rows, out)
+    print(f"Sweep finished in {time.time()-t0:.1f}s: {len(rows)} runs -> {out}")
+    return write_results(rows, out)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a grid of GA configurations")
+    parser.add_argument("--grid", help='JSON file {"base": {...}, "grid": {CONFIG key: [values]}}')
+    parser.add_argument("--datasets", nargs="+")
+    parser.add_argument("--models", nargs="+")
+    parser.add_argument("--metrics", nargs="+")
+    parser.add_argument("--pop-sizes", nargs="+", type=int)
+    parser.add_argument("--pm", nargs="+", type=float)
+    parser.add_argument("--lambdas", nargs="+", type=float)
+    parser.add_argument("--seeds", nargs="+", type=int)
+    parser.add_argument("--set", nargs="+", default=[], metavar="KEY=VALUE", help="base CONFIG overrides")
+    parser.add_argument("--cores", type=int, default=os.cpu_count(), help="core budget shared by all runs")
+    parser.add_argument("--out", default="sweep/results.csv", help=".csv or .parquet results table")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    base, grid = {}, {}
+    if args.grid:
+        with open(args.grid, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+        base.update(spec.get("base", {}))
+        grid.update(spec.get("grid", {}))
+    for item in args.set:
+        key, _, value = item.partition("=")
+        base[key.upper()] = ga_core._parse_value(value)
+    for flag, key in GRID_FLAGS.items():
+        if getattr(args, flag):
+            grid[key] = getattr(args, flag)
+    base = {**ga_core.CONFIG, **base}
+    if base["DATA_CACHE"] is None:
+        base["DATA_CACHE"] = os.path.join(os.path.dirname(os.path.abspath(args.out)), "data_cache")
+    configs = expand_grid(base, grid)
+    print(f"{len(configs)} runs on {args.cores} cores")
+    df = run_sweep(configs, max(1, args.cores), args.out)
+    if len(df) and (df["status"] != "ok").any():
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()